@@ -0,0 +1,210 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.generator import DataGenerator, next_ids, write_db
+from reviews.management.commands.rebuild_ratings import rebuild_ratings
+from reviews.models import Category, Genre, Review, Title
+from reviews.search import rebuild_index
+from users.models import User
+
+BATCH_SIZE = 1000
+
+
+def percentile(values, share):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(share * (len(values) - 1))))
+    return values[index]
+
+
+@contextmanager
+def temporary_database(enabled=True, name=None):
+    # Замеры идут на отдельной базе, чтобы не трогать рабочие данные.
+    # name задаёт файл базы, иначе SQLite создаёт её в памяти
+    if not enabled:
+        yield
+        return
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    if name is not None:
+        test_settings['NAME'] = name
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
+
+
+def write_report(command, report, path):
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if path:
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(text)
+    else:
+        command.stdout.write(text)
+
+
+def seed(titles, reviews, comments):
+    titles = max(titles, 1)
+    generator = DataGenerator(
+        users=max(100, 2 * -(-reviews // titles)), categories=10, genres=20,
+        titles=titles, reviews=reviews, comments=comments, prefix='bench',
+        start_ids=next_ids(),
+    )
+    write_db(generator, BATCH_SIZE)
+    rebuild_ratings()
+    rebuild_index(Title.objects.all())
+
+
+class Command(BaseCommand):
+    help = ('Замеряет задержку, число запросов к базе и память '
+            'на основных эндпоинтах API и сохраняет отчёт в JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument(
+            '--iterations', type=int, default=50,
+            help='количество запросов на сценарий',
+        )
+        parser.add_argument(
+            '--anonymous', action='store_true',
+            help='читать каталог без токена (через кэш ответов)',
+        )
+        parser.add_argument(
+            '--current-db', action='store_true',
+            help='не создавать отдельную базу, а использовать текущую',
+        )
+        parser.add_argument('--output', help='файл для отчёта JSON')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations должен быть больше нуля')
+        with temporary_database(not options['current_db']), override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            EMAIL_OUTBOX_ASYNC=False,
+        ):
+            report = self.run(options)
+        write_report(self, report, options['output'])
+
+    def run(self, options):
+        started = time.perf_counter()
+        seed(options['titles'], options['reviews'], options['comments'])
+        seed_time = time.perf_counter() - started
+        scenarios = self.get_scenarios(options['anonymous'])
+        return {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'dataset': {
+                'titles': options['titles'],
+                'reviews': options['reviews'],
+                'comments': options['comments'],
+                'seed_seconds': round(seed_time, 3),
+            },
+            'iterations': options['iterations'],
+            'anonymous': options['anonymous'],
+            'scenarios': {
+                name: self.measure(name, request, options['iterations'])
+                for name, request in scenarios.items()
+            },
+        }
+
+    def get_scenarios(self, anonymous):
+        user = User.objects.filter(username__startswith='bench').first()
+        reader = APIClient()
+        if not anonymous:
+            reader.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+            )
+        title = Title.objects.order_by('-rating_count').first()
+        review = Review.objects.order_by('id').first()
+        genre = Genre.objects.order_by('id').first()
+        category = Category.objects.order_by('id').first()
+        anonymous_client = APIClient()
+        counter = iter(range(10 ** 9))
+
+        def signup():
+            number = next(counter)
+            return anonymous_client.post('/api/v1/auth/signup/', data={
+                'username': f'bench_signup{number}',
+                'email': f'bench_signup{number}@yamdb.fake',
+            })
+
+        def token():
+            return anonymous_client.post('/api/v1/auth/token/', data={
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user),
+            })
+
+        scenarios = {
+            'title_list': lambda: reader.get('/api/v1/titles/'),
+            'title_filter': lambda: reader.get(
+                f'/api/v1/titles/?genre={genre.slug}&category={category.slug}'
+            ),
+            'title_detail': lambda: reader.get(f'/api/v1/titles/{title.id}/'),
+            'signup': signup,
+            'token': token,
+        }
+        if title is not None and review is not None:
+            scenarios['review_list'] = lambda: reader.get(
+                f'/api/v1/titles/{title.id}/reviews/'
+            )
+            scenarios['comment_list'] = lambda: reader.get(
+                f'/api/v1/titles/{review.title_id}/reviews/'
+                f'{review.id}/comments/'
+            )
+        return scenarios
+
+    def measure(self, name, request, iterations):
+        request()
+        timings = []
+        queries = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = request()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(context.captured_queries))
+        if response.status_code >= 400:
+            raise CommandError(
+                f'Сценарий {name} завершился статусом {response.status_code}'
+            )
+        tracemalloc.start()
+        peaks = []
+        for _ in range(min(iterations, 5)):
+            tracemalloc.reset_peak()
+            request()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        return {
+            'status': response.status_code,
+            'latency_ms': {
+                'mean': round(statistics.mean(timings), 3),
+                'p50': round(percentile(timings, 0.5), 3),
+                'p90': round(percentile(timings, 0.9), 3),
+                'p99': round(percentile(timings, 0.99), 3),
+                'max': round(max(timings), 3),
+            },
+            'queries': {
+                'mean': round(statistics.mean(queries), 2),
+                'max': max(queries),
+            },
+            'peak_alloc_kb': round(max(peaks) / 1024, 1),
+        }
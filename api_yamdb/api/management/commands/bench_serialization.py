@@ -0,0 +1,138 @@
+import platform
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from api.management.commands.bench import (seed, temporary_database,
+                                           write_report)
+from api.titles.serializers import (CommentSerializer, ReviewSerializer,
+                                    TitleReadSerializer)
+from api.utils.renderers import FastJSONRenderer, orjson
+from api.utils.values import ValuesPlan
+from reviews.models import Comment, Review, Title
+
+
+def get_endpoints():
+    title = Title.objects.order_by('-rating_count').first()
+    review = Comment.objects.values_list(
+        'review_id', flat=True
+    ).order_by('review_id').first()
+    return {
+        'titles': (
+            TitleReadSerializer,
+            Title.objects.select_related('category').prefetch_related(
+                'genre'
+            ).order_by('id'),
+        ),
+        'reviews': (
+            ReviewSerializer,
+            Review.objects.filter(title=title).select_related(
+                'author'
+            ).order_by('-pub_date', '-id'),
+        ),
+        'comments': (
+            CommentSerializer,
+            Comment.objects.filter(review_id=review).select_related(
+                'author'
+            ).order_by('id'),
+        ),
+    }
+
+
+def serializer_path(renderer):
+    def render(serializer_class, queryset, size):
+        data = serializer_class(list(queryset[:size]), many=True).data
+        return renderer.render(data)
+    return render
+
+
+def values_path(renderer):
+    def render(serializer_class, queryset, size):
+        plan = ValuesPlan.build(serializer_class(), queryset.model)
+        rows = queryset.prefetch_related(None).values(*plan.columns)[:size]
+        return renderer.render(plan.render(rows))
+    return render
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает скорость сериализации страниц произведений, '
+            'отзывов и комментариев: сериализаторы DRF и сборка из values()')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=2000)
+        parser.add_argument('--reviews', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--page-sizes', default='10,50,100,500',
+            help='размеры страниц через запятую',
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument(
+            '--current-db', action='store_true',
+            help='не создавать отдельную базу, а использовать текущую',
+        )
+        parser.add_argument('--output', help='файл для отчёта JSON')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['page_sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--page-sizes: ожидаются целые числа')
+        if options['iterations'] < 1 or min(sizes) < 1:
+            raise CommandError('Размеры и число повторов должны быть больше 0')
+        with temporary_database(not options['current_db']):
+            seed(options['titles'], options['reviews'], options['comments'])
+            report = {
+                'environment': {
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'database': connection.vendor,
+                    'orjson': orjson is not None,
+                },
+                'iterations': options['iterations'],
+                'endpoints': self.run(sizes, options['iterations']),
+            }
+        write_report(self, report, options['output'])
+
+    def run(self, sizes, iterations):
+        paths = {
+            'serializer': serializer_path(JSONRenderer()),
+            'serializer_fast_json': serializer_path(FastJSONRenderer()),
+            'values_fast_json': values_path(FastJSONRenderer()),
+        }
+        report = {}
+        for name, (serializer_class, queryset) in get_endpoints().items():
+            report[name] = {}
+            for size in sizes:
+                results = {}
+                for path, render in paths.items():
+                    results[path] = self.measure(
+                        render, serializer_class, queryset, size, iterations
+                    )
+                baseline = results['serializer']['ms_per_page']
+                for result in results.values():
+                    result['speedup'] = round(
+                        baseline / result['ms_per_page'], 2
+                    ) if result['ms_per_page'] else None
+                report[name][size] = results
+        return report
+
+    def measure(self, render, serializer_class, queryset, size, iterations):
+        body = render(serializer_class, queryset, size)
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            render(serializer_class, queryset, size)
+            timings.append(time.perf_counter() - started)
+        mean = statistics.mean(timings)
+        rows = min(size, queryset.count())
+        return {
+            'rows': rows,
+            'bytes': len(body),
+            'ms_per_page': round(mean * 1000, 3),
+            'rows_per_second': round(rows / mean) if mean else None,
+        }
@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.management.commands.bench import (percentile, seed,
+                                           temporary_database, write_report)
+from api.sqlite import apply_pragmas, read_pragmas
+from reviews.models import Review, Title
+from users.models import User
+
+# Настройки SQLite по умолчанию: журнал отката, полная синхронизация,
+# без отображения в память, кэш около 2 МБ
+BASELINE_PRAGMAS = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'mmap_size': 0,
+    'cache_size': -2000,
+}
+
+REPORTED_PRAGMAS = (
+    'journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout',
+)
+
+
+class EnvironFactory(RequestFactory):
+    # Отдаёт WSGI-окружение вместо запроса: его обрабатывает WSGIHandler
+    # целиком, с сигналами начала и конца запроса, как под сервером
+    def request(self, **request):
+        return self._base_environ(**request)
+
+
+def call(handler, environ):
+    statuses = []
+    response = handler(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    try:
+        for _ in response:
+            pass
+    finally:
+        # Здесь close_old_connections закрывает соединение, если
+        # CONN_MAX_AGE истёк
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+@contextmanager
+def database_profile(pragmas, max_age):
+    settings_dict = connection.settings_dict
+    old_age = settings_dict.get('CONN_MAX_AGE', 0)
+    connections.close_all()
+    settings_dict['CONN_MAX_AGE'] = max_age
+    logger = logging.getLogger('django.request')
+    logger.disabled = True
+    try:
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            connection.ensure_connection()
+            # Соединение с базой в памяти не закрывается, поэтому
+            # PRAGMA применяются к нему явно
+            apply_pragmas(connection, pragmas)
+            yield
+    finally:
+        logger.disabled = False
+        connections.close_all()
+        settings_dict['CONN_MAX_AGE'] = old_age
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность смешанной нагрузки чтения '
+            'и записи на SQLite с настройками по умолчанию и с PRAGMA '
+            'из SQLITE_PRAGMAS и постоянными соединениями')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='число потоков-обработчиков, как у воркера gthread',
+        )
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='запросов на поток в каждом профиле',
+        )
+        parser.add_argument(
+            '--write-share', type=float, default=0.2,
+            help='доля запросов на запись (новые комментарии)',
+        )
+        parser.add_argument(
+            '--current-db', action='store_true',
+            help='не создавать отдельную базу, а использовать текущую',
+        )
+        parser.add_argument('--output', help='файл для отчёта JSON')
+
+    def handle(self, *args, **options):
+        if options['threads'] < 1 or options['requests'] < 1:
+            raise CommandError(
+                '--threads и --requests должны быть больше нуля'
+            )
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда замеряет только базу SQLite')
+        directory = None if options['current_db'] else tempfile.mkdtemp()
+        name = directory and os.path.join(directory, 'bench.sqlite3')
+        try:
+            with temporary_database(directory is not None, name):
+                report = self.run(options)
+        finally:
+            if directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+        write_report(self, report, options['output'])
+
+    def run(self, options):
+        seed(options['titles'], options['reviews'], options['comments'])
+        profiles = {
+            'baseline': (BASELINE_PRAGMAS, 0),
+            'tuned': (
+                settings.SQLITE_PRAGMAS,
+                connection.settings_dict.get('CONN_MAX_AGE', 0),
+            ),
+        }
+        results = {
+            name: self.measure(pragmas, max_age, options)
+            for name, (pragmas, max_age) in profiles.items()
+        }
+        baseline = results['baseline']['throughput_rps']
+        return {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'sqlite': connection.Database.sqlite_version,
+            },
+            'threads': options['threads'],
+            'requests_per_thread': options['requests'],
+            'write_share': options['write_share'],
+            'profiles': results,
+            'speedup': round(
+                results['tuned']['throughput_rps'] / baseline, 3
+            ) if baseline else None,
+        }
+
+    def get_requests(self):
+        user = User.objects.filter(username__startswith='bench').first()
+        title = Title.objects.order_by('-rating_count').first()
+        review = Review.objects.order_by('id').first()
+        if user is None or title is None or review is None:
+            raise CommandError('Нет данных для замера')
+        factory = EnvironFactory(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+        comments = (f'/api/v1/titles/{review.title_id}/reviews/'
+                    f'{review.id}/comments/')
+        data = json.dumps({'text': 'Комментарий из замера'})
+        return {
+            'read': lambda: factory.get(f'/api/v1/titles/{title.id}/reviews/'),
+            'write': lambda: factory.post(
+                comments, data=data, content_type='application/json'
+            ),
+        }
+
+    def measure(self, pragmas, max_age, options):
+        requests = self.get_requests()
+        handler = WSGIHandler()
+        timings = {'read': [], 'write': []}
+        errors = []
+        lock = threading.Lock()
+
+        def worker(number):
+            choice = random.Random(number)
+            local = {'read': [], 'write': []}
+            failed = 0
+            try:
+                for _ in range(options['requests']):
+                    kind = ('write' if choice.random() < options['write_share']
+                            else 'read')
+                    environ = requests[kind]()
+                    started = time.perf_counter()
+                    status = call(handler, environ)
+                    local[kind].append((time.perf_counter() - started) * 1000)
+                    failed += status >= 500
+            finally:
+                connections.close_all()
+            with lock:
+                for kind, values in local.items():
+                    timings[kind].extend(values)
+                errors.append(failed)
+
+        with database_profile(pragmas, max_age):
+            applied = read_pragmas(connection, REPORTED_PRAGMAS)
+            threads = [
+                threading.Thread(target=worker, args=(number, ))
+                for number in range(options['threads'])
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        total = options['threads'] * options['requests']
+        return {
+            'pragmas': applied,
+            'conn_max_age': max_age,
+            'seconds': round(elapsed, 3),
+            'throughput_rps': round((total - sum(errors)) / elapsed, 1),
+            'errors': sum(errors),
+            'latency_ms': {
+                kind: {
+                    'count': len(values),
+                    'mean': round(statistics.mean(values), 3),
+                    'p50': round(percentile(values, 0.5), 3),
+                    'p99': round(percentile(values, 0.99), 3),
+                } if values else None
+                for kind, values in timings.items()
+            },
+        }
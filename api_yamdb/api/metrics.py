@@ -0,0 +1,228 @@
+import bisect
+import hmac
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.http import Http404, HttpResponse
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.views import APIView
+
+from api.utils.timing import set_current
+from api.writes import write_queue
+from users.utils.permissions import IsAdmin
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Имя метрики -> (описание, поле RequestMetrics, границы корзин)
+HISTOGRAMS = {
+    'yamdb_request_duration_seconds': (
+        'Полное время обработки запроса', 'wall_time', None,
+    ),
+    'yamdb_request_sql_seconds': (
+        'Время выполнения SQL за запрос', 'sql_time', None,
+    ),
+    'yamdb_request_serializer_seconds': (
+        'Время сериализации ответа', 'serializer_time', None,
+    ),
+    'yamdb_request_queries': (
+        'Число запросов к базе за запрос', 'queries',
+        (1, 2, 5, 10, 20, 50, 100, 200, 500),
+    ),
+}
+
+_lock = threading.Lock()
+# (метрика, маршрут) -> [счётчики по корзинам, сумма, количество]
+_histograms = {}
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0
+        self.serializer_time = 0
+        self.wall_time = 0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self):
+        return ', '.join((
+            f'db;dur={self.sql_time * 1000:.2f};desc="{self.queries} queries"',
+            f'serializer;dur={self.serializer_time * 1000:.2f}',
+            f'total;dur={self.wall_time * 1000:.2f}',
+        ))
+
+
+def get_buckets(bounds):
+    return bounds or settings.REQUEST_METRICS_BUCKETS
+
+
+def observe(route, metrics):
+    with _lock:
+        for name, (_, field, bounds) in HISTOGRAMS.items():
+            bounds = get_buckets(bounds)
+            value = getattr(metrics, field)
+            histogram = _histograms.setdefault(
+                (name, route), [[0] * len(bounds), 0, 0]
+            )
+            index = bisect.bisect_left(bounds, value)
+            if index < len(bounds):
+                histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+# Имя метрики -> (тип, описание, поле снимка очереди записи)
+WRITE_QUEUE_METRICS = {
+    'yamdb_write_queue_depth': (
+        'gauge', 'Записи, ожидающие писателя', 'depth',
+    ),
+    'yamdb_write_rejected_total': (
+        'counter', 'Записи, отклонённые из-за переполнения очереди',
+        'rejected',
+    ),
+    'yamdb_write_retries_total': (
+        'counter', 'Повторы транзакций после database is locked', 'retries',
+    ),
+    'yamdb_write_jobs_total': ('counter', 'Выполненные записи', 'jobs'),
+    'yamdb_write_commits_total': (
+        'counter', 'Транзакции писателя', 'commits',
+    ),
+}
+
+
+def render_write_queue():
+    snapshot = write_queue.snapshot()
+    lines = []
+    for name, (kind, help_text, field) in WRITE_QUEUE_METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.append(f'{name} {snapshot[field]}')
+    name = 'yamdb_write_queue_wait_seconds'
+    counts, total, count = snapshot['wait']
+    lines.append(f'# HELP {name} Время ожидания записи в очереди')
+    lines.append(f'# TYPE {name} histogram')
+    cumulative = 0
+    for bound, bucket in zip(snapshot['bounds'], counts):
+        cumulative += bucket
+        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {count}')
+    lines.append(f'{name}_sum {total:.6f}')
+    lines.append(f'{name}_count {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def render_prometheus():
+    with _lock:
+        snapshot = {
+            key: ([*counts], total, count)
+            for key, (counts, total, count) in _histograms.items()
+        }
+    lines = []
+    for name, (help_text, _, bounds) in HISTOGRAMS.items():
+        bounds = get_buckets(bounds)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (metric, route), (counts, total, count) in sorted(
+            snapshot.items()
+        ):
+            if metric != name:
+                continue
+            label = f'route="{route}"'
+            cumulative = 0
+            for bound, bucket in zip(bounds, counts):
+                cumulative += bucket
+                lines.append(
+                    f'{name}_bucket{{{label},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{{label}}} {total:.6f}')
+            lines.append(f'{name}_count{{{label}}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REQUEST_METRICS:
+            return self.get_response(request)
+        metrics = RequestMetrics()
+        set_current(metrics)
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            set_current(None)
+        metrics.wall_time = time.perf_counter() - metrics.started
+        match = request.resolver_match
+        route = match.url_name if match and match.url_name else 'unmatched'
+        observe(route, metrics)
+        response['Server-Timing'] = metrics.server_timing()
+        return response
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    # Сборщик метрик передаёт REQUEST_METRICS_TOKEN вместо JWT
+    def authenticate(self, request):
+        token = settings.REQUEST_METRICS_TOKEN
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if token and hmac.compare_digest(
+            header.encode(), f'Bearer {token}'.encode()
+        ):
+            return AnonymousUser(), token
+        return None
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="api"'
+
+
+class CanReadMetrics(IsAdmin):
+    def has_permission(self, request, view):
+        return (
+            request.auth is not None
+            and request.auth == settings.REQUEST_METRICS_TOKEN
+            or request.META.get('REMOTE_ADDR')
+            in settings.REQUEST_METRICS_ALLOWED_IPS
+            or super().has_permission(request, view)
+        )
+
+
+class MetricsView(APIView):
+    permission_classes = [CanReadMetrics]
+
+    def get_authenticators(self):
+        return [MetricsTokenAuthentication(), *super().get_authenticators()]
+
+    def initial(self, request, *args, **kwargs):
+        # Выключенные метрики не видны никому
+        if not settings.REQUEST_METRICS:
+            raise Http404
+        super().initial(request, *args, **kwargs)
+
+    def get(self, request):
+        return HttpResponse(
+            render_prometheus() + render_write_queue(),
+            content_type=PROMETHEUS_CONTENT_TYPE
+        )
+
+
+metrics_view = MetricsView.as_view()
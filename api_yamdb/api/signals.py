@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.sqlite import apply_pragmas
+from api.utils.cache import invalidate_catalogue
+from reviews.models import Category, Genre, Review, Title
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+@receiver(m2m_changed, sender=Title.genre.through)
+def catalogue_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_catalogue)
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection)
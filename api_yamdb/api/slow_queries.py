@@ -0,0 +1,102 @@
+import hashlib
+import json
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger('yamdb.slow_queries')
+
+# Числа внутри SQL (LIMIT, OFFSET) не меняют форму запроса
+NUMBERS = re.compile(r'\b\d+\b')
+
+
+def fingerprint(value):
+    return hashlib.md5(value.encode()).hexdigest()[:16]
+
+
+def get_view_name(view_func, method):
+    # У DRF представлений класс лежит в cls, действие вьюсета в actions
+    view = getattr(view_func, 'cls', view_func)
+    name = f'{view.__module__}.{view.__name__}'
+    action = getattr(view_func, 'actions', None)
+    if action and method.lower() in action:
+        name = f'{name}.{action[method.lower()]}'
+    return name
+
+
+def explain(db, sql, params):
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    try:
+        # Точка сохранения: ошибка EXPLAIN не ломает транзакцию запроса
+        with transaction.atomic(using=db.alias), db.cursor() as cursor:
+            cursor.execute(f'{db.ops.explain_query_prefix()} {sql}', params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+    except DatabaseError as error:
+        return [f'EXPLAIN не выполнен: {error}']
+
+
+class SlowQueryLog:
+
+    def __init__(self, request=None):
+        self.request = request
+        self.view = None
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        if duration >= settings.SLOW_QUERY_THRESHOLD and not self.explaining:
+            self.log(context['connection'], sql, params, many, duration)
+        return result
+
+    def log(self, db, sql, params, many, duration):
+        self.explaining = True
+        try:
+            plan = None if many else explain(db, sql, params)
+        finally:
+            self.explaining = False
+        record = {
+            'time': timezone.now().isoformat(),
+            'duration_ms': round(duration * 1000, 3),
+            'database': db.alias,
+            'sql': sql,
+            'fingerprint': fingerprint(NUMBERS.sub('N', sql)),
+            'params_fingerprint': fingerprint(repr(params)),
+            'param_types': [type(value).__name__ for value in params or ()]
+            if not many else 'many',
+            'view': self.view,
+            'route': None,
+            'method': None,
+            'path': None,
+            'plan': plan,
+        }
+        if self.request is not None:
+            match = self.request.resolver_match
+            record['route'] = match.view_name if match else None
+            record['method'] = self.request.method
+            record['path'] = self.request.path
+        logger.warning(json.dumps(record, ensure_ascii=False, default=str))
+
+
+class SlowQueryMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SLOW_QUERY_LOG:
+            return self.get_response(request)
+        request.slow_query_log = SlowQueryLog(request)
+        with connection.execute_wrapper(request.slow_query_log):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        slow_query_log = getattr(request, 'slow_query_log', None)
+        if slow_query_log is not None:
+            slow_query_log.view = get_view_name(view_func, request.method)
@@ -0,0 +1,27 @@
+from django.conf import settings
+
+
+def apply_pragmas(connection, pragmas=None):
+    # PRAGMA выполняются напрямую через sqlite3, мимо обёрток запросов
+    # и журнала connection.queries
+    if pragmas is None:
+        pragmas = settings.SQLITE_PRAGMAS
+    cursor = connection.connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+
+def read_pragmas(connection, names):
+    # Для базы в памяти часть PRAGMA (например, mmap_size) пуста
+    cursor = connection.connection.cursor()
+    try:
+        values = {}
+        for name in names:
+            row = cursor.execute(f'PRAGMA {name}').fetchone()
+            values[name] = row[0] if row else None
+        return values
+    finally:
+        cursor.close()
@@ -1,8 +1,14 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from api.utils.serializers import (SparseFieldsSerializerMixin,
+                                   UniqueConstraintSerializerMixin)
+from api.utils.timing import TimedSerializerMixin
 from reviews.models import Category, Comment, Genre, Review, Title
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin,
+                         serializers.ModelSerializer):
 
     class Meta:
         fields = ('name', 'slug')
@@ -10,7 +16,8 @@ class CategorySerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin,
+                      serializers.ModelSerializer):
 
     class Meta:
         fields = ('name', 'slug')
@@ -18,7 +25,8 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
-class TitleCreateSerializer(serializers.ModelSerializer):
+class TitleCreateSerializer(TimedSerializerMixin,
+                            serializers.ModelSerializer):
     category = serializers.SlugRelatedField(
         queryset=Category.objects.all(),
         slug_field='slug'
@@ -31,10 +39,12 @@ class TitleCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count', 'rating', 'modified')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsSerializerMixin,
+                          TimedSerializerMixin,
+                          serializers.ModelSerializer):
     category = CategorySerializer(
         read_only=True
     )
@@ -48,10 +58,26 @@ class TitleReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
-
-
-class ReviewSerializer(serializers.ModelSerializer):
+        exclude = ('rating_sum', 'rating_count', 'modified')
+
+    def get_collapsed_fields(self):
+        return {
+            'category': serializers.SlugRelatedField(
+                slug_field='slug',
+                read_only=True,
+            ),
+            'genre': serializers.SlugRelatedField(
+                slug_field='slug',
+                read_only=True,
+                many=True,
+            ),
+        }
+
+
+class ReviewSerializer(SparseFieldsSerializerMixin,
+                       UniqueConstraintSerializerMixin,
+                       TimedSerializerMixin,
+                       serializers.ModelSerializer):
 
     author = serializers.SlugRelatedField(
         slug_field='username',
@@ -62,21 +88,25 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        request = self.context.get('request')
-        if request.method == 'POST':
-            review = Review.objects.filter(
-                title=self.context['view'].kwargs.get('title_id'),
-                author=self.context['request'].user
-            )
-            if review.exists():
-                raise serializers.ValidationError(
-                    'Ваш отзыв на это произведение уже опубликован'
-                )
-        return data
-
-
-class CommentSerializer(serializers.ModelSerializer):
+    unique_errors = {
+        'unique_relationships': (
+            api_settings.NON_FIELD_ERRORS_KEY,
+            'Ваш отзыв на это произведение уже опубликован'
+        ),
+    }
+
+
+class ReviewBatchItemSerializer(serializers.ModelSerializer):
+    title = serializers.IntegerField(source='title_id')
+
+    class Meta:
+        fields = ('title', 'text', 'score')
+        model = Review
+
+
+class CommentSerializer(SparseFieldsSerializerMixin,
+                        TimedSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field="username",
         read_only=True,
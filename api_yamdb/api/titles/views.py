@@ -1,20 +1,68 @@
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
+from http.client import BAD_REQUEST, CONFLICT, CREATED, NOT_FOUND, OK
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from api.titles.serializers import (CategorySerializer, CommentSerializer,
-                                    GenreSerializer, ReviewSerializer,
-                                    TitleCreateSerializer, TitleReadSerializer)
-from api.utils.filters import TitleFilter
-from api.utils.mixins import ListCreateDestroyMixin
+                                    GenreSerializer, ReviewBatchItemSerializer,
+                                    ReviewSerializer, TitleCreateSerializer,
+                                    TitleReadSerializer)
+from api.utils.cache import get_or_compute, invalidate_catalogue
+from api.utils.filters import TitleFilter, TitleSearchFilter
+from api.utils.mixins import (CachedListMixin, CachedRetrieveMixin,
+                              ConditionalGetMixin, CursorPaginationMixin,
+                              ListCreateDestroyMixin, ParentObjectMixin,
+                              SparseFieldsMixin, ValuesListMixin)
+from api.utils.pagination import (CommentCursorPagination,
+                                  ReviewCursorPagination)
 from api.utils.permissions import (IsAdminOrModeratorOrReadOnly,
                                    IsAdminOrReadOnly)
-from reviews.models import Category, Genre, Review, Title
+from api.writes import write_queue
+from reviews.export import CONTENT_TYPES, EXPORTS, FORMATS, export
+from reviews.leaderboards import update_leaderboards
+from reviews.models import Category, Genre, Leaderboard, Review, Title
+from reviews.signals import update_rating
+from users.utils.permissions import IsAdmin
+
+
+class TopTitlesMixin:
+    # Лучшие произведения группы читаются из готовых списков Leaderboard
+    leaderboard_field = None
+
+    @action(detail=True, methods=['get'])
+    def top(self, request, *args, **kwargs):
+        return self.cached_response(self.get_top, request, *args, **kwargs)
+
+    def get_top(self, request, *args, **kwargs):
+        group = self.get_object()
+        entries = Leaderboard.objects.filter(
+            **{self.leaderboard_field: group}
+        ).select_related('title__category').prefetch_related('title__genre')
+        boards = {kind: [] for kind, _ in Leaderboard.KINDS}
+        for entry in entries:
+            boards[entry.kind].append(entry.title)
+        context = self.get_serializer_context()
+        return Response({
+            'count': group.titles_count,
+            **{
+                kind: TitleReadSerializer(
+                    titles, many=True, context=context
+                ).data
+                for kind, titles in boards.items()
+            },
+        })
 
 
-class CategoryViewSet(ListCreateDestroyMixin):
+class CategoryViewSet(TopTitlesMixin, CachedListMixin,
+                      ListCreateDestroyMixin):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly, ]
@@ -22,9 +70,10 @@ class CategoryViewSet(ListCreateDestroyMixin):
     search_fields = ['name', ]
     lookup_field = 'slug'
     pagination_class = PageNumberPagination
+    leaderboard_field = 'category'
 
 
-class GenreViewSet(ListCreateDestroyMixin):
+class GenreViewSet(TopTitlesMixin, CachedListMixin, ListCreateDestroyMixin):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [IsAdminOrReadOnly, ]
@@ -32,47 +81,210 @@ class GenreViewSet(ListCreateDestroyMixin):
     search_fields = ['name', ]
     lookup_field = 'slug'
     pagination_class = PageNumberPagination
+    leaderboard_field = 'genre'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.order_by('id').annotate(
-        rating=Avg('reviews__score')
-    )
+class TitleViewSet(ConditionalGetMixin, CachedListMixin, CachedRetrieveMixin,
+                   SparseFieldsMixin, ValuesListMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('id')
     serializer_class = TitleCreateSerializer
     permission_classes = [IsAdminOrReadOnly, ]
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [TitleSearchFilter, DjangoFilterBackend]
     filterset_class = TitleFilter
     pagination_class = PageNumberPagination
+    sparse_relations = {
+        'category': ('select', ('slug', ), ('name', 'slug')),
+        'genre': ('prefetch', (), ()),
+    }
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return TitleCreateSerializer
         return TitleReadSerializer
 
+    def get_validators(self):
+        # Валидаторы каталога сбрасываются вместе с кэшем ответов
+        return get_or_compute(
+            self.request, 'validators', self.compute_validators
+        )
+
+    def compute_validators(self):
+        if self.action == 'retrieve':
+            modified = Title.objects.filter(
+                pk=self.kwargs.get('pk')
+            ).values_list('modified', flat=True).first()
+            if modified is None:
+                return None
+            return f'title:{modified.isoformat()}', modified
+        state = self.filter_queryset(self.get_queryset()).aggregate(
+            count=Count('id'), modified=Max('modified')
+        )
+        modified = state['modified']
+        return (
+            f'titles:{state["count"]}:{modified and modified.isoformat()}',
+            modified
+        )
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, CursorPaginationMixin,
+                    ParentObjectMixin, SparseFieldsMixin, ValuesListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [IsAdminOrModeratorOrReadOnly, ]
+    cursor_pagination_class = ReviewCursorPagination
+    parent_queryset = Title.objects.all()
+    parent_lookups = {"pk": "title_id"}
+    parent_context_name = "title"
+    sparse_relations = {
+        'author': ('select', ('username', ), ('username', )),
+    }
 
     def get_queryset(self):
-        title_id = self.kwargs.get("title_id")
-        title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all()
+        return self.get_parent().reviews.select_related("author")
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get("title_id"))
-        serializer.save(author=self.request.user, title=title)
+        title = self.get_parent()
+        write_queue.submit(
+            lambda: serializer.save(author=self.request.user, title=title)
+        )
 
+    def get_validators(self):
+        modified = self.get_parent().modified
+        return f"reviews:{modified.isoformat()}", modified
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(ConditionalGetMixin, CursorPaginationMixin,
+                     ParentObjectMixin, SparseFieldsMixin, ValuesListMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [IsAdminOrModeratorOrReadOnly, ]
+    cursor_pagination_class = CommentCursorPagination
+    # Отзыв должен принадлежать произведению из URL
+    parent_queryset = Review.objects.select_related("title")
+    parent_lookups = {"pk": "review_id", "title": "title_id"}
+    parent_context_name = "review"
+    sparse_relations = {
+        'author': ('select', ('username', ), ('username', )),
+    }
 
     def get_queryset(self):
-        review_id = self.kwargs.get("review_id")
-        review = get_object_or_404(Review, id=review_id)
-        return review.comments.all()
+        return self.get_parent().comments.select_related("author")
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs.get("review_id"))
-        serializer.save(author=self.request.user, review=review)
+        review = self.get_parent()
+        write_queue.submit(
+            lambda: serializer.save(author=self.request.user, review=review)
+        )
+
+    def get_validators(self):
+        modified = self.get_parent().title.modified
+        return f"comments:{modified.isoformat()}", modified
+
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def export_data(request, name):
+    if name not in EXPORTS:
+        return Response(
+            {"detail": f"Неизвестная выгрузка: {name}"}, status=NOT_FOUND
+        )
+    output = request.query_params.get("output", "ndjson")
+    if output not in FORMATS:
+        return Response(
+            {"output": f"Допустимые форматы: {', '.join(FORMATS)}"},
+            status=BAD_REQUEST
+        )
+    response = StreamingHttpResponse(
+        export(name, output), content_type=CONTENT_TYPES[output]
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{name}.{output}"'
+    )
+    return response
+
+
+def check_review_batch(items, user):
+    # Возвращает ошибки по позициям и ещё не сохранённые отзывы
+    errors = {}
+    valid = {}
+    for index, item in enumerate(items):
+        serializer = ReviewBatchItemSerializer(data=item)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+    title_ids = {data["title_id"] for data in valid.values()}
+    titles = set(Title.objects.filter(
+        id__in=title_ids
+    ).values_list("id", flat=True))
+    reviewed = set(Review.objects.filter(
+        author=user, title_id__in=titles
+    ).values_list("title_id", flat=True))
+    reviews = {}
+    for index, data in valid.items():
+        if data["title_id"] not in titles:
+            errors[index] = {"title": ["Произведение не найдено"]}
+        elif data["title_id"] in reviewed:
+            errors[index] = {
+                "title": ["Ваш отзыв на это произведение уже опубликован"]
+            }
+        else:
+            reviewed.add(data["title_id"])
+            reviews[index] = Review(author=user, **data)
+    return errors, reviews
+
+
+def save_review_batch(reviews, user):
+    ratings = {}
+    for review in reviews:
+        total, count = ratings.get(review.title_id, (0, 0))
+        ratings[review.title_id] = (total + review.score, count + 1)
+    with transaction.atomic():
+        Review.objects.bulk_create(reviews)
+        for title_id, (total, count) in ratings.items():
+            update_rating(title_id, total, count)
+        update_leaderboards(ratings)
+        transaction.on_commit(invalidate_catalogue)
+    # bulk_create на SQLite не возвращает id, пара (title, author)
+    # уникальна, поэтому id находятся одним запросом
+    return dict(Review.objects.filter(
+        author=user, title_id__in=ratings
+    ).values_list("title_id", "id"))
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def review_batch(request):
+    items = request.data
+    if not isinstance(items, list):
+        return Response(
+            {"detail": "Ожидается список отзывов"}, status=BAD_REQUEST
+        )
+    if len(items) > settings.REVIEW_BATCH_MAX_SIZE:
+        return Response(
+            {"detail": "Слишком много отзывов в одном запросе, максимум "
+                       f"{settings.REVIEW_BATCH_MAX_SIZE}"},
+            status=BAD_REQUEST
+        )
+    errors, reviews = check_review_batch(items, request.user)
+    try:
+        ids = save_review_batch(list(reviews.values()), request.user)
+    except IntegrityError:
+        return Response(
+            {"detail": "Отзывы изменились во время загрузки, "
+                       "повторите запрос"},
+            status=CONFLICT
+        )
+    results = []
+    for index in range(len(items)):
+        if index in errors:
+            results.append({"index": index, "status": BAD_REQUEST,
+                            "errors": errors[index]})
+        else:
+            title_id = reviews[index].title_id
+            results.append({"index": index, "status": CREATED,
+                            "id": ids[title_id]})
+    return Response(results, status=OK)
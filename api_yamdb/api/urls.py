@@ -1,8 +1,10 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from api.metrics import metrics_view
 from api.titles.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                              ReviewViewSet, TitleViewSet)
+                              ReviewViewSet, TitleViewSet, export_data,
+                              review_batch)
 from users.users.views import UserViewSet, singup, token_jwt
 
 
@@ -25,5 +27,8 @@ router.register(
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/signup/', singup, name='singup'),
-    path('v1/auth/token/', token_jwt, name='token')
+    path('v1/auth/token/', token_jwt, name='token'),
+    path('v1/export/<slug:name>/', export_data, name='export'),
+    path('v1/reviews/batch/', review_batch, name='reviews-batch'),
+    path('v1/metrics/', metrics_view, name='metrics'),
 ]
@@ -0,0 +1,43 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = 'catalogue:version'
+
+
+def get_cache():
+    return caches[settings.CATALOGUE_CACHE_ALIAS]
+
+
+def get_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def invalidate_catalogue():
+    # Старые ответы не удаляются, а перестают находиться по ключу
+    get_cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def make_key(request):
+    url = request.build_absolute_uri()
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f'catalogue:{get_version()}:{digest}'
+
+
+def get_or_compute(request, name, compute):
+    cache = get_cache()
+    key = f'{make_key(request)}:{name}'
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, settings.CATALOGUE_CACHE_TIMEOUT)
+    return value
@@ -1,5 +1,20 @@
-from django_filters.rest_framework import CharFilter, FilterSet, NumberFilter
+from django_filters.constants import EMPTY_VALUES
+from django_filters.rest_framework import (CharFilter, FilterSet, NumberFilter,
+                                           OrderingFilter)
+from rest_framework.filters import BaseFilterBackend
 from reviews.models import Title
+from reviews.search import search_titles
+
+
+class TitleOrderingFilter(OrderingFilter):
+    # id в конце делает порядок однозначным для пагинации
+    # и совпадает с составными индексами произведений
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        ordering = [self.get_ordering_value(param) for param in value]
+        ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return qs.order_by(*ordering)
 
 
 class TitleFilter(FilterSet):
@@ -7,7 +22,22 @@ class TitleFilter(FilterSet):
     genre = CharFilter(field_name='genre__slug')
     category = CharFilter(field_name='category__slug')
     year = NumberFilter()
+    ordering = TitleOrderingFilter(fields=(
+        ('rating', 'rating'),
+        ('year', 'year'),
+        ('name', 'name'),
+        ('rating_count', 'review_count'),
+    ))
 
     class Meta:
         model = Title
         fields = ('name', 'category', 'genre', 'year')
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    # Полнотекстовый поиск по названию и описанию с ранжированием
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        return search_titles(queryset, query)
@@ -1,4 +1,26 @@
+import hashlib
+from http.client import NOT_MODIFIED, OK
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework import mixins, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from api.utils.cache import get_cache, make_key
+from api.utils.timing import serializer_timer
+from api.utils.values import ValuesPlan
+
+
+def get_ordering_columns(paginator):
+    # Курсорная пагинация читает поля сортировки у объектов
+    ordering = getattr(paginator, 'ordering', None) or ()
+    if isinstance(ordering, str):
+        ordering = (ordering, )
+    return {name.lstrip('-') for name in ordering}
 
 
 class ListCreateDestroyMixin(
@@ -8,3 +30,219 @@ class ListCreateDestroyMixin(
     viewsets.GenericViewSet
 ):
     pass
+
+
+class CursorPaginationMixin:
+    # Курсорная пагинация включается для вьюсета целиком
+    # или для запроса параметром ?pagination=cursor
+    cursor_pagination_class = None
+    cursor_by_default = False
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        if 'cursor' in params:
+            return True
+        mode = params.get('pagination')
+        if mode is None:
+            return self.cursor_by_default
+        return mode == 'cursor'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if (self.cursor_pagination_class is not None
+                    and self.use_cursor_pagination()):
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+
+class ParentObjectMixin:
+    # Родительский объект из URL загружается один раз за запрос, одним
+    # запросом с проверкой всей цепочки, и передаётся сериализатору
+    parent_queryset = None
+    # Поле родительской модели -> именованный аргумент URL
+    parent_lookups = {}
+    parent_context_name = None
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(self.parent_queryset, **{
+                field: self.kwargs.get(kwarg)
+                for field, kwarg in self.parent_lookups.items()
+            })
+        return self._parent
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context[self.parent_context_name] = self.get_parent()
+        return context
+
+
+class CatalogueCacheMixin:
+    # Ответы на GET-запросы анонимов хранятся в кэше до изменения каталога
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = make_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == OK:
+            cache.set(key, response.data, settings.CATALOGUE_CACHE_TIMEOUT)
+        return response
+
+
+class CachedListMixin(CatalogueCacheMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CatalogueCacheMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    # Валидаторы считаются до сериализации: если ETag или Last-Modified
+    # совпали с присланными клиентом, отдаётся 304 без тела.
+    # None - ответ без валидаторов
+    def get_validators(self):
+        return None
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+        marker, modified = validators
+        etag = quote_etag(hashlib.md5(
+            f'{marker}:{request.accepted_media_type}'.encode()
+        ).hexdigest())
+        last_modified = int(modified.timestamp()) if modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (OK, NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class SparseFieldsMixin:
+    # ?fields=id,name оставляет в ответе только перечисленные поля,
+    # ?expand=genre разворачивает вложенные объекты. Запрос к базе
+    # выбирает только нужные столбцы и связи.
+    fields_param = 'fields'
+    expand_param = 'expand'
+    # Поле сериализатора -> (способ загрузки связи: select или prefetch,
+    # столбцы свёрнутого объекта, столбцы развёрнутого объекта)
+    sparse_relations = {}
+
+    def get_param_set(self, param):
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self.parse_sparse_fields()
+        return self._sparse_fields
+
+    def parse_sparse_fields(self):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return None, None
+        fields = self.get_param_set(self.fields_param)
+        expand = self.get_param_set(self.expand_param)
+        if fields is None and expand is None:
+            return None, None
+        available = set(self.get_serializer_class()().fields)
+        unknown = (fields or set()) - available
+        if unknown:
+            raise ValidationError({self.fields_param: (
+                f'Неизвестные поля: {", ".join(sorted(unknown))}'
+            )})
+        unknown = (expand or set()) - set(self.sparse_relations)
+        if unknown:
+            raise ValidationError({self.expand_param: (
+                f'Нельзя развернуть: {", ".join(sorted(unknown))}'
+            )})
+        return fields, expand or set()
+
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.get_sparse_fields()
+        if expand is not None:
+            kwargs.setdefault('fields', fields)
+            kwargs.setdefault('expand', expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, expand = self.get_sparse_fields()
+        if expand is None:
+            return queryset
+        if fields is None:
+            fields = set(self.get_serializer_class()().fields)
+        return self.prune_queryset(queryset, fields, expand)
+
+    def prune_queryset(self, queryset, fields, expand):
+        columns = {'pk'} | get_ordering_columns(self.paginator)
+        select, prefetch = [], []
+        for name in fields:
+            if name not in self.sparse_relations:
+                columns.add(name)
+                continue
+            method, collapsed, expanded = self.sparse_relations[name]
+            if method == 'prefetch':
+                prefetch.append(name)
+                continue
+            select.append(name)
+            columns.add(name)
+            columns.update(
+                f'{name}__{column}'
+                for column in (expanded if name in expand else collapsed)
+            )
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+        return queryset.prefetch_related(*prefetch).only(*columns)
+
+
+class ValuesListMixin:
+    # При VALUES_SERIALIZATION список собирается из строк values() без
+    # создания моделей; ответ совпадает с ответом сериализатора
+    def list(self, request, *args, **kwargs):
+        plan = None
+        if settings.VALUES_SERIALIZATION:
+            serializer = self.get_serializer()
+            plan = ValuesPlan.build(serializer, serializer.Meta.model)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.prefetch_related(None).values(
+            *plan.columns, *get_ordering_columns(self.paginator)
+        )
+        page = self.paginate_queryset(rows)
+        with serializer_timer():
+            data = plan.render(rows if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
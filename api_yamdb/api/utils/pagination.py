@@ -0,0 +1,122 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+def keyset_condition(bounds):
+    # (a, b) после (x, y): a <= x AND (a < x OR b после y); первое
+    # условие задаёт диапазон по индексу
+    name, lookup, value = bounds[0]
+    condition = Q(**{f'{name}__{lookup}': value})
+    if len(bounds) == 1:
+        return condition
+    return Q(**{f'{name}__{lookup}e': value}) & (
+        condition | keyset_condition(bounds[1:])
+    )
+
+
+class KeysetCursorPagination(CursorPagination):
+    # Позиция курсора хранит значения всех полей сортировки, а не только
+    # первого, поэтому строки с одинаковой датой не пропускаются
+    # смещением: следующая страница всегда берётся условием по индексу
+
+    def encode_position(self, values):
+        return json.dumps([str(value) for value in values])
+
+    def decode_position(self, position, model):
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            # Значения приводятся к типам полей, чтобы подделанный курсор
+            # не доходил до фильтра
+            values = [
+                model._meta.get_field(order.lstrip('-')).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+        except (ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in values:
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            name = order.lstrip('-')
+            if isinstance(instance, dict):
+                value = instance[name]
+            else:
+                value = getattr(instance, name)
+            values.append(
+                value.isoformat() if hasattr(value, 'isoformat') else value
+            )
+        return self.encode_position(values)
+
+    def filter_position(self, queryset, reverse, position):
+        bounds = []
+        values = self.decode_position(position, queryset.model)
+        for order, value in zip(self.ordering, values):
+            descending = order.startswith('-')
+            lookup = 'lt' if reverse != descending else 'gt'
+            bounds.append((order.lstrip('-'), lookup, value))
+        return queryset.filter(keyset_condition(bounds))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Повторяет CursorPagination.paginate_queryset, кроме условия
+        # по позиции курсора
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = self.filter_position(
+                queryset, reverse, current_position
+            )
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        self.set_positions(reverse, offset, current_position,
+                           following_position)
+        if reverse:
+            self.page = list(reversed(self.page))
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def set_positions(self, reverse, offset, current, following):
+        moved = current is not None or offset > 0
+        if reverse:
+            self.has_next, self.has_previous = moved, following is not None
+            self.next_position, self.previous_position = current, following
+        else:
+            self.has_next, self.has_previous = following is not None, moved
+            self.next_position, self.previous_position = following, current
+
+
+class ReviewCursorPagination(KeysetCursorPagination):
+    ordering = ('-pub_date', '-id')
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    ordering = ('id', )
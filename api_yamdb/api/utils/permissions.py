@@ -17,7 +17,7 @@ class IsAdminOrModeratorOrReadOnly(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         if request.user.is_authenticated:
-            return (obj.author == request.user
+            return (obj.author_id == request.user.id
                     or request.user.is_superuser
                     or request.user.role == 'admin'
                     or request.user.role == 'moderator')
@@ -0,0 +1,31 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    # Кодирует ответ через orjson, если он установлен; результат тот же,
+    # что у JSONRenderer. Даты и прочие нестандартные типы отдаются
+    # кодировщику DRF, отступы и ASCII-режим обрабатывает JSONRenderer
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact or self.get_indent(
+                    accepted_media_type, renderer_context or {}
+                ) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer, экранируем разделители строк JavaScript
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
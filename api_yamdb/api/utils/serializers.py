@@ -0,0 +1,57 @@
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+
+def violated_constraint(error, model):
+    # Имя уникального поля или ограничения из текста IntegrityError:
+    # SQLite перечисляет столбцы, PostgreSQL называет индекс
+    table = model._meta.db_table
+    message = str(error)
+    for field in model._meta.fields:
+        if field.unique and (f'{table}.{field.column}' in message
+                             or f'{table}_{field.column}_' in message):
+            return field.name
+    for constraint in model._meta.constraints:
+        columns = ', '.join(
+            f'{table}.{model._meta.get_field(name).column}'
+            for name in constraint.fields
+        )
+        if constraint.name in message or message.endswith(columns):
+            return constraint.name
+    return None
+
+
+class UniqueConstraintSerializerMixin:
+    # Уникальность проверяет сама БД при записи, без запросов перед ней;
+    # нарушение ограничения превращается в ответ 400.
+    # unique_errors: имя поля или ограничения -> (поле ответа, сообщение)
+    unique_errors = {}
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as error:
+            name = violated_constraint(error, self.Meta.model)
+            if name not in self.unique_errors:
+                raise
+            field, message = self.unique_errors[name]
+            raise serializers.ValidationError({field: [message]}) from error
+
+
+class SparseFieldsSerializerMixin:
+    # Принимает fields и expand от SparseFieldsMixin: лишние поля
+    # убираются, а неразвёрнутые вложенные объекты заменяются на slug
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if expand is None:
+            return
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name, field in self.get_collapsed_fields().items():
+            if name in self.fields and name not in expand:
+                self.fields[name] = field
+
+    def get_collapsed_fields(self):
+        return {}
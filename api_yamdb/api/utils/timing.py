@@ -0,0 +1,36 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# Метрики текущего запроса, их заводит MetricsMiddleware
+_local = threading.local()
+
+
+def get_current():
+    return getattr(_local, 'metrics', None)
+
+
+def set_current(metrics):
+    _local.metrics = metrics
+
+
+@contextmanager
+def serializer_timer():
+    # Учитывается только внешний сериализатор, вложенные уже внутри него
+    metrics = get_current()
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_time += time.perf_counter() - started
+        metrics.serializing = False
+
+
+class TimedSerializerMixin:
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
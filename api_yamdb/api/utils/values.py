@@ -0,0 +1,161 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, SlugRelatedField
+
+# Виды полей в плане: значение столбца, slug связанного объекта,
+# вложенный объект, список вложенных объектов или slug через M2M
+COLUMN, SLUG, NESTED, MANY_NESTED, MANY_SLUG = range(5)
+
+
+def get_columns(serializer, model):
+    # Простые поля вложенного сериализатора: имя -> (столбец, поле)
+    columns = {}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if (isinstance(field, (serializers.Serializer,
+                               serializers.RelatedField, ManyRelatedField))
+                or '.' in field.source or field.source == '*'):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.is_relation:
+            return None
+        columns[name] = (field.source, field)
+    return columns
+
+
+class ValuesPlan:
+    # Собирает тот же ответ, что и сериализатор, прямо из строк values():
+    # без создания моделей и обхода полей у каждого объекта
+    def __init__(self, model, entries):
+        self.model = model
+        self.entries = entries
+        self.columns = {model._meta.pk.name}
+        for name, kind, source, spec in entries:
+            if kind == COLUMN:
+                self.columns.add(source)
+            elif kind == SLUG:
+                self.columns.add(f'{source}__{spec}')
+            elif kind == NESTED:
+                self.columns.add(source)
+                self.columns.update(
+                    f'{source}__{column}' for column, _ in spec.values()
+                )
+
+    @classmethod
+    def build(cls, serializer, model):
+        entries = []
+        for name, field in serializer.fields.items():
+            entry = cls.get_entry(field, model)
+            if entry is None:
+                return None
+            if entry is not False:
+                entries.append((name, *entry))
+        return cls(model, entries)
+
+    @classmethod
+    def get_entry(cls, field, model):
+        if field.write_only:
+            return False
+        if '.' in field.source or field.source == '*':
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.is_relation:
+            return cls.get_relation_entry(field, model_field)
+        if (not model_field.concrete or isinstance(
+                field, (serializers.Serializer, serializers.RelatedField,
+                        ManyRelatedField))):
+            return None
+        return COLUMN, field.source, field
+
+    @classmethod
+    def get_relation_entry(cls, field, model_field):
+        if model_field.many_to_one:
+            if isinstance(field, SlugRelatedField):
+                return SLUG, field.source, field.slug_field
+            if isinstance(field, serializers.ModelSerializer):
+                columns = get_columns(field, model_field.related_model)
+                if columns is not None:
+                    return NESTED, field.source, columns
+        elif isinstance(model_field, models.ManyToManyField):
+            if (isinstance(field, ManyRelatedField) and isinstance(
+                    field.child_relation, SlugRelatedField)):
+                return (MANY_SLUG, field.source,
+                        field.child_relation.slug_field)
+            if isinstance(field, serializers.ListSerializer):
+                columns = get_columns(field.child, model_field.related_model)
+                if columns is not None:
+                    return MANY_NESTED, field.source, columns
+        return None
+
+    def get_related(self, source, columns, ids):
+        # Одним запросом к промежуточной таблице, в порядке prefetch_related
+        m2m = self.model._meta.get_field(source)
+        owner, target = m2m.m2m_field_name(), m2m.m2m_reverse_field_name()
+        ordering = [
+            f'-{target}__{name[1:]}' if name.startswith('-')
+            else f'{target}__{name}'
+            for name in m2m.related_model._meta.ordering
+        ]
+        related = {}
+        for row in m2m.remote_field.through.objects.filter(
+            **{f'{owner}__in': ids}
+        ).order_by(*ordering).values(
+            owner, *(f'{target}__{column}' for column in columns)
+        ):
+            related.setdefault(row[owner], []).append(row)
+        return target, related
+
+    def render(self, rows):
+        rows = list(rows)
+        pk = self.model._meta.pk.name
+        ids = [row[pk] for row in rows]
+        related = {}
+        for name, kind, source, spec in self.entries:
+            if kind == MANY_SLUG:
+                related[name] = self.get_related(source, [spec], ids)
+            elif kind == MANY_NESTED:
+                related[name] = self.get_related(
+                    source, [column for column, _ in spec.values()], ids
+                )
+        return [self.render_row(row, row[pk], related) for row in rows]
+
+    def render_row(self, row, pk, related):
+        data = {}
+        for name, kind, source, spec in self.entries:
+            if kind == COLUMN:
+                value = row[source]
+                data[name] = None if value is None else (
+                    spec.to_representation(value)
+                )
+            elif kind == SLUG:
+                data[name] = row[f'{source}__{spec}']
+            elif kind == NESTED:
+                data[name] = None if row[source] is None else (
+                    render_nested(row, f'{source}__', spec)
+                )
+            else:
+                target, objects = related[name]
+                prefix = f'{target}__'
+                data[name] = [
+                    obj[prefix + spec] if kind == MANY_SLUG
+                    else render_nested(obj, prefix, spec)
+                    for obj in objects.get(pk, ())
+                ]
+        return data
+
+
+def render_nested(row, prefix, columns):
+    return {
+        name: None if row[prefix + column] is None else (
+            field.to_representation(row[prefix + column])
+        )
+        for name, (column, field) in columns.items()
+    }
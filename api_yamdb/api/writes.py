@@ -0,0 +1,166 @@
+import bisect
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from rest_framework.exceptions import APIException
+
+
+class WriteBusy(APIException):
+    status_code = 503
+    default_detail = 'Сервер перегружен записью, повторите запрос позже'
+    default_code = 'write_busy'
+
+
+def is_locked(error):
+    message = str(error)
+    return 'locked' in message or 'busy' in message
+
+
+def backoff(attempt):
+    # Полный разброс: потоки и процессы не повторяют запись одновременно
+    return random.uniform(0, settings.WRITE_RETRY_DELAY * 2 ** attempt)
+
+
+class WriteJob:
+
+    def __init__(self, func):
+        self.func = func
+        self.submitted = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class WriteQueue:
+    # Все записи процесса идут через одного писателя: поток, который
+    # захватил блокировку, выполняет старейшие задачи очереди, по
+    # WRITE_GROUP_SIZE за одну транзакцию, каждую в своей точке сохранения.
+    # Остальные ждут, пока их задачу выполнит писатель или они сами.
+    # Конфликты с другими процессами повторяются с задержкой
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._writer = threading.Lock()
+        self._pending = deque()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.rejected = 0
+            self.retries = 0
+            self.jobs = 0
+            self.commits = 0
+            self.bounds = settings.REQUEST_METRICS_BUCKETS
+            self.wait = [[0] * len(self.bounds), 0, 0]
+
+    def submit(self, func):
+        if connection.in_atomic_block:
+            # Внешнюю транзакцию нельзя ни повторить, ни объединить
+            return func()
+        job = WriteJob(func)
+        with self._lock:
+            if len(self._pending) >= settings.WRITE_QUEUE_SIZE:
+                self.rejected += 1
+                raise WriteBusy()
+            self._pending.append(job)
+        deadline = job.submitted + settings.WRITE_QUEUE_TIMEOUT
+        while not job.done.is_set():
+            timeout = deadline - time.perf_counter()
+            if timeout > 0 and self._writer.acquire(timeout=timeout):
+                try:
+                    if not job.done.is_set():
+                        self.run_group()
+                finally:
+                    self._writer.release()
+            elif self.cancel(job):
+                raise WriteBusy()
+            else:
+                # Задачу уже выполняет писатель
+                job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def cancel(self, job):
+        with self._lock:
+            if job not in self._pending:
+                return False
+            self._pending.remove(job)
+            self.rejected += 1
+            return True
+
+    def run_group(self):
+        with self._lock:
+            size = min(len(self._pending), settings.WRITE_GROUP_SIZE)
+            group = [self._pending.popleft() for _ in range(size)]
+        started = time.perf_counter()
+        for job in group:
+            self.observe_wait(started - job.submitted)
+        try:
+            self.commit(group)
+        except Exception as error:
+            if isinstance(error, OperationalError) and is_locked(error):
+                error = WriteBusy()
+            for job in group:
+                job.error = error
+        finally:
+            for job in group:
+                job.done.set()
+
+    def commit(self, group):
+        for attempt in range(settings.WRITE_RETRIES + 1):
+            try:
+                with transaction.atomic():
+                    for job in group:
+                        self.run_job(job)
+            except OperationalError as error:
+                if not is_locked(error) or attempt == settings.WRITE_RETRIES:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                time.sleep(backoff(attempt))
+            else:
+                break
+        with self._lock:
+            self.jobs += len(group)
+            self.commits += 1
+
+    def run_job(self, job):
+        job.result = job.error = None
+        try:
+            with transaction.atomic():
+                job.result = job.func()
+        except OperationalError as error:
+            if is_locked(error):
+                # Повторяется вся транзакция группы
+                raise
+            job.error = error
+        except Exception as error:
+            job.error = error
+
+    def observe_wait(self, value):
+        with self._lock:
+            index = bisect.bisect_left(self.bounds, value)
+            if index < len(self.bounds):
+                self.wait[0][index] += 1
+            self.wait[1] += value
+            self.wait[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'depth': len(self._pending),
+                'rejected': self.rejected,
+                'retries': self.retries,
+                'jobs': self.jobs,
+                'commits': self.commits,
+                'bounds': self.bounds,
+                'wait': ([*self.wait[0]], self.wait[1], self.wait[2]),
+            }
+
+
+write_queue = WriteQueue()
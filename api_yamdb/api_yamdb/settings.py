@@ -29,6 +29,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.slow_queries.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,9 +68,57 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Соединение переживает запрос и используется потоком повторно
+        'CONN_MAX_AGE': 60,
     }
 }
 
+# PRAGMA для каждого нового соединения с SQLite. В режиме WAL читатели
+# не ждут писателя, а synchronous=NORMAL сбрасывает данные на диск
+# только на контрольных точках журнала
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    # Отображение файла базы в память, байты
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение задаёт размер кэша страниц в КиБ
+    'cache_size': -64 * 1024,
+    # Сколько миллисекунд ждать освобождения блокировки записи
+    'busy_timeout': 5000,
+}
+
+# Отзывы, комментарии и регистрации записываются через одного писателя
+# на процесс. Сколько записей может ждать очереди, дальше ответ 503
+WRITE_QUEUE_SIZE = 64
+
+# Сколько секунд запись ждёт своей очереди
+WRITE_QUEUE_TIMEOUT = 10
+
+# Сколько ожидающих записей писатель объединяет в одну транзакцию,
+# 1 отключает групповую фиксацию
+WRITE_GROUP_SIZE = 1
+
+# Повторы транзакции при "database is locked" и начальная задержка
+# перед повтором в секундах, она удваивается с каждой попыткой
+WRITE_RETRIES = 5
+
+WRITE_RETRY_DELAY = 0.05
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    }
+}
+
+# Кэш публичных страниц каталога: категории, жанры, произведения
+CATALOGUE_CACHE_ALIAS = 'default'
+
+CATALOGUE_CACHE_TIMEOUT = 60 * 5
+
 
 # Password validation
 
@@ -111,13 +161,75 @@ AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.RoleJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated'
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Списки произведений, отзывов и комментариев собираются из values()
+# без создания моделей
+VALUES_SERIALIZATION = False
+
+# Максимум отзывов в одном запросе /api/v1/reviews/batch/
+REVIEW_BATCH_MAX_SIZE = 1000
+
+# Длина списков лучших произведений жанра и категории
+LEADERBOARD_SIZE = 10
+
+# Метрики запросов: заголовок Server-Timing и гистограммы по маршрутам
+# на /api/v1/metrics/ в формате Prometheus
+REQUEST_METRICS = False
+
+# Кроме администраторов, метрики читают по токену в заголовке
+# Authorization: Bearer и с адресов из списка
+REQUEST_METRICS_TOKEN = None
+REQUEST_METRICS_ALLOWED_IPS = ()
+
+# Границы корзин гистограмм времени, секунды
+REQUEST_METRICS_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+
+# Журнал медленных запросов к базе вместе с планом EXPLAIN
+SLOW_QUERY_LOG = False
+
+# Порог в секундах, начиная с которого запрос попадает в журнал
+SLOW_QUERY_THRESHOLD = 0.1
+
+SLOW_QUERY_LOG_FILE = os.path.join(BASE_DIR, 'slow_queries.log')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'yamdb.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
 }
 
 SIMPLE_JWT = {
@@ -126,8 +238,36 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Пользователь берётся из claims токена без запроса к базе;
+# смена роли отзывает ранее выданные токены
+STATELESS_JWT = False
+
+# Общий для всех процессов кэш версий токенов (например, Redis) перед
+# столбцом User.token_version; None - версии читаются из базы.
+# Кэш в памяти процесса (LocMemCache) не допускается
+STATELESS_JWT_CACHE_ALIAS = None
+
+# Сколько секунд процесс помнит версию токенов пользователя: столько
+# другие процессы могут принимать отозванный токен
+STATELESS_JWT_CACHE_TIMEOUT = 5
+
+# Сколько пользователей помнит процесс
+STATELESS_JWT_MEMO_SIZE = 10000
+
 # DEFAULT_FROM_EMAIL = 'admin@yamdb.com'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Очередь писем: отправка в фоновых потоках с повторными попытками
+EMAIL_OUTBOX_ASYNC = True
+
+EMAIL_OUTBOX_WORKERS = 2
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# Задержка перед повтором, секунды; удваивается с каждой попыткой
+EMAIL_OUTBOX_RETRY_DELAY = 30
+
+EMAIL_OUTBOX_SENDING_TIMEOUT = 300
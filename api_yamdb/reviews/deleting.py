@@ -0,0 +1,33 @@
+import threading
+from contextlib import contextmanager
+
+# Произведения и авторы, которые удаляются вместе с отзывами: рейтинг
+# удаляемого произведения не пересчитывается, а списки лучших
+# обновляются один раз после удаления автора, а не на каждый отзыв.
+# Состояние живёт только внутри вызова delete()
+_local = threading.local()
+
+
+def get_deleting():
+    if not hasattr(_local, 'titles'):
+        _local.titles = set()
+        # автор -> произведения его удалённых отзывов
+        _local.authors = {}
+    return _local
+
+
+@contextmanager
+def deleting(titles=(), authors=()):
+    state = get_deleting()
+    titles = set(titles) - state.titles
+    authors = set(authors) - state.authors.keys()
+    state.titles.update(titles)
+    for author in authors:
+        state.authors[author] = set()
+    try:
+        yield state
+    finally:
+        # Удаление могло упасть до post_delete
+        state.titles.difference_update(titles)
+        for author in authors:
+            state.authors.pop(author, None)
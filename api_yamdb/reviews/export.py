@@ -0,0 +1,62 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Comment, Review, Title
+
+CHUNK_SIZE = 2000
+
+EXPORTS = {
+    'titles': (
+        Title,
+        ('id', 'name', 'year', 'description', 'category__slug',
+         'rating_sum', 'rating_count'),
+    ),
+    'reviews': (
+        Review,
+        ('id', 'title_id', 'author__username', 'text', 'score', 'pub_date'),
+    ),
+    'comments': (
+        Comment,
+        ('id', 'review_id', 'author__username', 'text', 'pub_date'),
+    ),
+}
+
+FORMATS = ('ndjson', 'csv')
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class Echo:
+    # Псевдо-файл для csv.writer: строка сразу отдаётся генератору
+    def write(self, value):
+        return value
+
+
+def export_rows(name, chunk_size=CHUNK_SIZE):
+    model, fields = EXPORTS[name]
+    queryset = model.objects.order_by('pk').values_list(*fields)
+    return fields, queryset.iterator(chunk_size=chunk_size)
+
+
+def render_ndjson(fields, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def render_csv(fields, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def export(name, output='ndjson', chunk_size=CHUNK_SIZE):
+    fields, rows = export_rows(name, chunk_size)
+    if output == 'csv':
+        return render_csv(fields, rows)
+    return render_ndjson(fields, rows)
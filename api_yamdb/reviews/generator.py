@@ -0,0 +1,231 @@
+import bisect
+import csv
+import itertools
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Max
+
+from reviews.management.commands.import_csv import keep_auto_now_add
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+CSV_COLUMNS = {
+    'users.csv': ('id', 'username', 'email', 'role', 'bio',
+                  'first_name', 'last_name'),
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'titles.csv': ('id', 'name', 'year', 'category'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+
+WORDS = (
+    'тихий', 'долгий', 'последний', 'красный', 'северный', 'город', 'берег',
+    'ветер', 'сад', 'дорога', 'ночь', 'огонь', 'история', 'песня', 'море',
+    'время', 'дом', 'тень', 'зима', 'свет', 'сон', 'поезд', 'остров',
+)
+
+EPOCH = datetime(2010, 1, 1, tzinfo=timezone.utc)
+PERIOD = timedelta(days=365 * 12).total_seconds()
+
+
+def zipf_weights(count, exponent):
+    return list(itertools.accumulate(
+        1 / rank ** exponent for rank in range(1, count + 1)
+    ))
+
+
+# Популярность произведений распределена по Ципфу, поэтому число отзывов
+# на произведение подчиняется степенному закону; при одном seed данные
+# всегда одинаковые
+class DataGenerator:
+
+    def __init__(self, seed=0, users=1000, categories=10, genres=30,
+                 titles=1000, reviews=10000, comments=10000, exponent=1.1,
+                 prefix='user', start_ids=None):
+        self.random = random.Random(seed)
+        self.users = max(users, 1)
+        self.categories = max(categories, 1)
+        self.genres = max(genres, 1)
+        self.titles = max(titles, 1)
+        self.reviews = reviews
+        self.comments = comments
+        self.exponent = exponent
+        self.prefix = prefix
+        self.start_ids = start_ids or {}
+
+    def first_id(self, name):
+        return self.start_ids.get(name, 1)
+
+    def sentence(self, words):
+        return ' '.join(self.random.choice(WORDS) for _ in range(words))
+
+    def timestamp(self):
+        return EPOCH + timedelta(seconds=self.random.random() * PERIOD)
+
+    def pick(self, weights, count):
+        index = bisect.bisect(weights, self.random.random() * weights[-1])
+        return min(index, count - 1)
+
+    def user_rows(self):
+        start = self.first_id('users')
+        for pk in range(start, start + self.users):
+            username = f'{self.prefix}{pk}'
+            yield (pk, username, f'{username}@yamdb.fake', 'user', '', '', '')
+
+    def category_rows(self):
+        start = self.first_id('category')
+        for pk in range(start, start + self.categories):
+            yield pk, f'Категория {pk}', f'{self.prefix}-category-{pk}'
+
+    def genre_rows(self):
+        start = self.first_id('genre')
+        for pk in range(start, start + self.genres):
+            yield pk, f'Жанр {pk}', f'{self.prefix}-genre-{pk}'
+
+    def title_rows(self):
+        weights = zipf_weights(self.categories, self.exponent)
+        start = self.first_id('titles')
+        category_start = self.first_id('category')
+        for pk in range(start, start + self.titles):
+            # Новых произведений больше, чем старых
+            year = 1900 + int(122 * self.random.betavariate(5, 2))
+            category = category_start + self.pick(weights, self.categories)
+            yield pk, self.sentence(3).capitalize(), year, category
+
+    def genre_title_rows(self):
+        weights = zipf_weights(self.genres, self.exponent)
+        pk = self.first_id('genre_title')
+        genre_start = self.first_id('genre')
+        for title in range(self.first_id('titles'),
+                           self.first_id('titles') + self.titles):
+            fan_out = min(self.genres, 1 + int(self.random.expovariate(1)))
+            genres = set()
+            while len(genres) < fan_out:
+                genres.add(self.pick(weights, self.genres))
+            for genre in sorted(genres):
+                yield pk, title, genre_start + genre
+                pk += 1
+
+    def review_counts(self):
+        # Число отзывов на произведение по Ципфу, не больше числа
+        # пользователей: у пары (произведение, автор) один отзыв
+        ranks = list(range(self.titles))
+        self.random.shuffle(ranks)
+        weights = [1 / (rank + 1) ** self.exponent for rank in ranks]
+        total = sum(weights)
+        counts = [
+            min(self.users, int(self.reviews * weight / total))
+            for weight in weights
+        ]
+        left = min(self.reviews, self.titles * self.users) - sum(counts)
+        for index in sorted(range(self.titles), key=ranks.__getitem__):
+            if left <= 0:
+                break
+            extra = min(left, self.users - counts[index])
+            counts[index] += extra
+            left -= extra
+        return counts
+
+    def review_rows(self):
+        pk = self.first_id('review')
+        title_start = self.first_id('titles')
+        user_start = self.first_id('users')
+        for index, count in enumerate(self.review_counts()):
+            quality = self.random.uniform(3, 9)
+            authors = self.random.sample(range(self.users), count)
+            for author in authors:
+                score = min(10, max(1, round(self.random.gauss(quality, 2))))
+                yield (pk, title_start + index, self.sentence(8).capitalize(),
+                       user_start + author, score, self.timestamp())
+                pk += 1
+        self.review_count = pk - self.first_id('review')
+
+    def comment_rows(self):
+        reviews = getattr(self, 'review_count', 0)
+        if not reviews:
+            return
+        pk = self.first_id('comments')
+        review_start = self.first_id('review')
+        user_start = self.first_id('users')
+        for pk in range(pk, pk + self.comments):
+            # Обсуждают в основном первые (самые популярные) отзывы
+            review = int(reviews * self.random.random() ** 3)
+            yield (pk, review_start + review, self.sentence(6).capitalize(),
+                   user_start + self.random.randrange(self.users),
+                   self.timestamp())
+
+    def tables(self):
+        # Порядок важен: отзывы должны быть сгенерированы до комментариев
+        return (
+            ('users.csv', self.user_rows),
+            ('category.csv', self.category_rows),
+            ('genre.csv', self.genre_rows),
+            ('titles.csv', self.title_rows),
+            ('genre_title.csv', self.genre_title_rows),
+            ('review.csv', self.review_rows),
+            ('comments.csv', self.comment_rows),
+        )
+
+
+def write_csv(generator, path):
+    os.makedirs(path, exist_ok=True)
+    counts = {}
+    for filename, rows in generator.tables():
+        with open(os.path.join(path, filename), 'w', encoding='utf-8',
+                  newline='') as output:
+            writer = csv.writer(output)
+            writer.writerow(CSV_COLUMNS[filename])
+            count = 0
+            for row in rows():
+                writer.writerow(
+                    value.isoformat() if isinstance(value, datetime)
+                    else value for value in row
+                )
+                count += 1
+        counts[filename] = count
+    return counts
+
+
+MODELS = {
+    'users.csv': (User, ('id', 'username', 'email', 'role', 'bio',
+                         'first_name', 'last_name')),
+    'category.csv': (Category, ('id', 'name', 'slug')),
+    'genre.csv': (Genre, ('id', 'name', 'slug')),
+    'titles.csv': (Title, ('id', 'name', 'year', 'category_id')),
+    'genre_title.csv': (Title.genre.through, ('id', 'title_id', 'genre_id')),
+    'review.csv': (Review, ('id', 'title_id', 'text', 'author_id', 'score',
+                            'pub_date')),
+    'comments.csv': (Comment, ('id', 'review_id', 'text', 'author_id',
+                               'pub_date')),
+}
+
+
+def next_ids():
+    return {
+        filename[:-len('.csv')]: (
+            model.objects.aggregate(last=Max('id'))['last'] or 0
+        ) + 1
+        for filename, (model, _) in MODELS.items()
+    }
+
+
+def write_db(generator, batch_size=1000):
+    counts = {}
+    for filename, rows in generator.tables():
+        model, fields = MODELS[filename]
+        count = 0
+        batch = []
+        with keep_auto_now_add(model):
+            for row in rows():
+                batch.append(model(**dict(zip(fields, row))))
+                if len(batch) >= batch_size:
+                    model.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            model.objects.bulk_create(batch)
+        counts[filename] = count + len(batch)
+    return counts
@@ -0,0 +1,192 @@
+from django.conf import settings
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from reviews.models import Category, Genre, Leaderboard, Title
+
+GROUPS = (('category', Category), ('genre', Genre))
+
+
+def board_queryset(field, group_id, kind):
+    # Условие по тому же столбцу, что и сортировка, чтобы индекс
+    # (category, -столбец, id) отдавал строки сразу по порядку
+    column = 'rating' if kind == Leaderboard.RATING else 'rating_count'
+    titles = Title.objects.filter(**{field: group_id})
+    if kind == Leaderboard.RATING:
+        titles = titles.filter(rating__isnull=False)
+    else:
+        titles = titles.filter(rating_count__gt=0)
+    return titles.annotate(value=F(column)).order_by('-value', 'id')
+
+
+def refresh_board(field, group_id, kind):
+    rows = board_queryset(field, group_id, kind).values_list(
+        'id', 'value'
+    )[:settings.LEADERBOARD_SIZE]
+    Leaderboard.objects.filter(**{field: group_id}, kind=kind).delete()
+    Leaderboard.objects.bulk_create(
+        Leaderboard(**{f'{field}_id': group_id}, kind=kind,
+                    position=position, title_id=title_id, value=value)
+        for position, (title_id, value) in enumerate(rows, 1)
+    )
+
+
+def count_titles(model, ids):
+    if model is Category:
+        titles = Title.objects.filter(category=OuterRef('pk'))
+        group = 'category'
+    else:
+        titles = Title.genre.through.objects.filter(genre=OuterRef('pk'))
+        group = 'genre'
+    titles = titles.order_by().values(group).annotate(total=Count('id'))
+    model.objects.filter(pk__in=ids).update(
+        titles_count=Coalesce(Subquery(titles.values('total')), 0)
+    )
+
+
+def refresh_groups(categories=(), genres=()):
+    for (field, model), ids in zip(GROUPS, (categories, genres)):
+        ids = {pk for pk in ids if pk is not None}
+        if not ids:
+            continue
+        count_titles(model, ids)
+        for group_id in ids:
+            for kind, _ in Leaderboard.KINDS:
+                refresh_board(field, group_id, kind)
+
+
+def title_groups(title_ids):
+    categories = Title.objects.filter(
+        pk__in=title_ids
+    ).values_list('category_id', flat=True)
+    genres = Title.genre.through.objects.filter(
+        title_id__in=title_ids
+    ).values_list('genre_id', flat=True)
+    return set(categories), set(genres)
+
+
+def rebuild_leaderboards(title_ids=None):
+    if title_ids is None:
+        refresh_groups(
+            Category.objects.values_list('pk', flat=True),
+            Genre.objects.values_list('pk', flat=True),
+        )
+    else:
+        refresh_groups(*title_groups(title_ids))
+
+
+def rank(title_id, value):
+    # Меньший ключ выше в списке: по убыванию значения, при равенстве по id
+    return (-value, title_id)
+
+
+def rerank(entries, bound, title_id, value):
+    # entries - список (title_id, value) по местам, bound - нижняя граница
+    # ключей произведений вне списка (None, если вне списка их нет).
+    # Возвращает новую границу или False, если без пересчёта по таблице
+    # произведений место не определить
+    ids = [entry[0] for entry in entries]
+    on_board = title_id in ids
+    if on_board:
+        del entries[ids.index(title_id)]
+    if value is None:
+        # Оценок не осталось: место займёт кто-то из невошедших
+        return False if on_board and bound is not None else bound
+    key = rank(title_id, value)
+    if on_board and bound is not None and key > bound:
+        return False
+    if not on_board and len(entries) >= settings.LEADERBOARD_SIZE and (
+        key > rank(*entries[-1])
+    ):
+        return key if bound is None else min(bound, key)
+    entries.append((title_id, value))
+    entries.sort(key=lambda entry: rank(*entry))
+    if len(entries) > settings.LEADERBOARD_SIZE:
+        key = rank(*entries.pop())
+        bound = key if bound is None else min(bound, key)
+    return bound
+
+
+def write_board(field, group_id, kind, old, new):
+    # Меняются только строки на местах, где сменилось произведение
+    # или значение
+    board = Leaderboard.objects.filter(**{field: group_id}, kind=kind)
+    for position, entry in enumerate(new[:len(old)], 1):
+        if entry != old[position - 1]:
+            board.filter(position=position).update(
+                title_id=entry[0], value=entry[1]
+            )
+    if len(new) < len(old):
+        board.filter(position__gt=len(new)).delete()
+    Leaderboard.objects.bulk_create(
+        Leaderboard(**{f'{field}_id': group_id}, kind=kind,
+                    position=position, title_id=title_id, value=value)
+        for position, (title_id, value) in enumerate(new, 1)
+        if position > len(old)
+    )
+
+
+def update_board(key, members, entries):
+    old = list(entries)
+    bound = None
+    if len(entries) >= settings.LEADERBOARD_SIZE:
+        bound = rank(*entries[-1])
+    for title_id, value in sorted(members):
+        bound = rerank(entries, bound, title_id, value)
+        if bound is False:
+            refresh_board(*key)
+            return
+    if entries != old:
+        write_board(*key, old, entries)
+
+
+def load_members(title_ids):
+    # (поле, группа, список) -> [(произведение, значение или None)]
+    titles = {
+        pk: (category_id, {
+            Leaderboard.RATING: rating if rating_count else None,
+            Leaderboard.REVIEWS: rating_count or None,
+        })
+        for pk, category_id, rating, rating_count in Title.objects.filter(
+            pk__in=title_ids
+        ).values_list('pk', 'category_id', 'rating', 'rating_count')
+    }
+    groups = [
+        (pk, 'category', category_id)
+        for pk, (category_id, _) in titles.items() if category_id is not None
+    ]
+    groups += [
+        (title_id, 'genre', genre_id)
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=titles
+        ).values_list('title_id', 'genre_id')
+    ]
+    members = {}
+    for title_id, field, group_id in groups:
+        for kind, value in titles[title_id][1].items():
+            members.setdefault((field, group_id, kind), []).append(
+                (title_id, value)
+            )
+    return members
+
+
+def update_leaderboards(title_ids):
+    # Списки переставляются на месте; таблица произведений перебирается
+    # только когда произведение опускается ниже невошедших в список
+    members = load_members(title_ids)
+    categories = {key[1] for key in members if key[0] == 'category'}
+    genres = {key[1] for key in members if key[0] == 'genre'}
+    boards = {}
+    for category_id, genre_id, kind, title_id, value in (
+        Leaderboard.objects.filter(
+            Q(category__in=categories) | Q(genre__in=genres)
+        ).order_by('position').values_list(
+            'category_id', 'genre_id', 'kind', 'title_id', 'value'
+        )
+    ):
+        group = ('category', category_id) if genre_id is None else (
+            'genre', genre_id
+        )
+        boards.setdefault((*group, kind), []).append((title_id, value))
+    for key, board_members in members.items():
+        update_board(key, board_members, boards.get(key, []))
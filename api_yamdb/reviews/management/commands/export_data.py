@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from reviews.export import CHUNK_SIZE, EXPORTS, FORMATS, export
+
+
+class Command(BaseCommand):
+    help = 'Выгружает произведения, отзывы или комментарии в NDJSON или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(EXPORTS))
+        parser.add_argument(
+            '--output',
+            choices=FORMATS,
+            default='ndjson',
+            help='формат выгрузки',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='количество строк, читаемых из базы за раз',
+        )
+        parser.add_argument(
+            '--file',
+            help='файл для записи (по умолчанию stdout)',
+        )
+
+    def handle(self, *args, **options):
+        lines = export(
+            options['name'], options['output'], options['chunk_size']
+        )
+        if options['file']:
+            with open(options['file'], 'w', encoding='utf-8',
+                      newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.utils.cache import invalidate_catalogue
+from reviews.generator import DataGenerator, next_ids, write_csv, write_db
+from reviews.management.commands.rebuild_ratings import rebuild_ratings
+from reviews.models import Title
+from reviews.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = ('Генерирует правдоподобные данные с перекосом популярности '
+            'и записывает их в базу или в CSV в формате static/data')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument(
+            '--exponent', type=float, default=1.1,
+            help='показатель распределения Ципфа для популярности',
+        )
+        parser.add_argument(
+            '--prefix', default='user',
+            help='префикс имён пользователей и slug',
+        )
+        parser.add_argument(
+            '--csv', metavar='PATH',
+            help='каталог для CSV вместо записи в базу',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+        if min(options['reviews'], options['comments']) < 0:
+            raise CommandError('Количество записей не может быть меньше нуля')
+        params = {
+            name: options[name] for name in (
+                'seed', 'users', 'categories', 'genres', 'titles',
+                'reviews', 'comments', 'exponent', 'prefix',
+            )
+        }
+        if options['csv']:
+            counts = write_csv(DataGenerator(**params), options['csv'])
+        else:
+            with transaction.atomic():
+                generator = DataGenerator(start_ids=next_ids(), **params)
+                counts = write_db(generator, options['batch_size'])
+                rebuild_ratings()
+                rebuild_index(Title.objects.all())
+            invalidate_catalogue()
+        for filename, count in counts.items():
+            self.stdout.write(f'{filename}: записано строк {count}')
+        self.stdout.write(self.style.SUCCESS('Генерация завершена'))
@@ -0,0 +1,171 @@
+import csv
+import os
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from api.utils.cache import invalidate_catalogue
+from reviews.management.commands.rebuild_ratings import rebuild_ratings
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import rebuild_index
+from users.models import User
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+# Файл, модель и колонки-ссылки на ранее загруженные модели
+TABLES = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category': Category}),
+    ('genre_title.csv', Title.genre.through,
+     {'title_id': Title, 'genre_id': Genre}),
+    ('review.csv', Review, {'title_id': Title, 'author': User}),
+    ('comments.csv', Comment, {'review_id': Review, 'author': User}),
+)
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    # bulk_create перезаписывает auto_now_add поля текущим временем
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из csv-файлов static/data в базу'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DATA_DIR,
+            help='папка с csv-файлами',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='количество строк в одном INSERT',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+        self.known_ids = {}
+        with transaction.atomic():
+            for filename, model, relations in TABLES:
+                path = os.path.join(options['path'], filename)
+                if not os.path.exists(path):
+                    self.stdout.write(f'{filename}: файл не найден, пропущен')
+                    continue
+                with keep_auto_now_add(model):
+                    count = self.import_file(path, model, relations)
+                self.stdout.write(f'{filename}: загружено строк {count}')
+            rebuild_ratings()
+            rebuild_index(Title.objects.all())
+        invalidate_catalogue()
+        self.stdout.write(self.style.SUCCESS('Импорт завершён'))
+
+    def get_known_ids(self, model):
+        if model not in self.known_ids:
+            self.known_ids[model] = set(
+                model.objects.values_list('pk', flat=True).iterator()
+            )
+        return self.known_ids[model]
+
+    def import_file(self, path, model, relations):
+        known_ids = self.get_known_ids(model)
+        batch = []
+        count = 0
+        with open(path, encoding='utf-8', newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+            fields = self.get_fields(model, reader.fieldnames, path)
+            for row in reader:
+                try:
+                    obj = self.build_object(model, fields, relations, row)
+                except ValidationError as error:
+                    raise CommandError(
+                        f'{os.path.basename(path)}, строка '
+                        f'{reader.line_num}: {"; ".join(error.messages)}'
+                    )
+                if obj.pk in known_ids:
+                    raise CommandError(
+                        f'{os.path.basename(path)}, строка '
+                        f'{reader.line_num}: id {obj.pk} уже существует'
+                    )
+                known_ids.add(obj.pk)
+                batch.append((reader.line_num, obj))
+                if len(batch) >= self.batch_size:
+                    self.save_batch(path, model, batch)
+                    count += len(batch)
+                    batch = []
+        if batch:
+            self.save_batch(path, model, batch)
+            count += len(batch)
+        return count
+
+    def save_batch(self, path, model, batch):
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create([obj for _, obj in batch])
+        except IntegrityError:
+            # Строка, нарушившая ограничение, ищется поштучной вставкой;
+            # вставленные строки откатит ошибка команды
+            for line_num, obj in batch:
+                try:
+                    with transaction.atomic():
+                        model.objects.bulk_create([obj])
+                except IntegrityError as error:
+                    raise CommandError(
+                        f'{os.path.basename(path)}, строка '
+                        f'{line_num}: {error}'
+                    )
+            raise
+
+    def get_fields(self, model, columns, path):
+        fields = {}
+        for column in columns or ():
+            try:
+                fields[column] = model._meta.get_field(column)
+            except FieldDoesNotExist:
+                raise CommandError(
+                    f'{os.path.basename(path)}: неизвестная колонка {column}'
+                )
+        return fields
+
+    def build_object(self, model, fields, relations, row):
+        values = {}
+        for column, field in fields.items():
+            raw = row[column]
+            if column in relations:
+                values[field.attname] = self.resolve(
+                    relations[column], column, raw
+                )
+            else:
+                values[field.attname] = field.clean(raw, None)
+        if model is User:
+            values['password'] = make_password(None)
+        return model(**values)
+
+    def resolve(self, model, column, raw):
+        try:
+            pk = int(raw)
+        except ValueError:
+            raise ValidationError(f'{column}: некорректный id {raw!r}')
+        if pk not in self.get_known_ids(model):
+            raise ValidationError(f'{column}: объект с id {pk} не найден')
+        return pk
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from api.utils.cache import invalidate_catalogue
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import Review, Title
+from reviews.signals import average_rating
+
+
+def rebuild_ratings(titles=None):
+    title_ids = None
+    if titles is None:
+        titles = Title.objects.all()
+    else:
+        title_ids = titles.values_list('pk', flat=True)
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    updated = titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        ),
+    )
+    titles.update(rating=average_rating(F('rating_sum'), F('rating_count')))
+    # Списки лучших строятся по сохранённому рейтингу
+    rebuild_leaderboards(title_ids)
+    return updated
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённый рейтинг произведений по отзывам'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids',
+            nargs='*',
+            type=int,
+            help='id произведений (по умолчанию все)',
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['title_ids']:
+            titles = titles.filter(pk__in=options['title_ids'])
+        with transaction.atomic():
+            updated = rebuild_ratings(titles)
+        invalidate_catalogue()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
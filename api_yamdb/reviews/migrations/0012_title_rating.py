@@ -0,0 +1,44 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:28
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_delete_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='сумма оценок'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'id'], name='comment_review_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+    ]
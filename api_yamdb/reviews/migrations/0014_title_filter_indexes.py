@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_review_comment_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'id'], name='title_category_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='дата изменения'),
+        ),
+    ]
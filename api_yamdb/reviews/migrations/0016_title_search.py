@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from reviews.search import create_index, index_titles
+
+    create_index(schema_editor)
+    if schema_editor.connection.vendor == 'sqlite':
+        Title = apps.get_model('reviews', 'Title')
+        index_titles(
+            Title.objects.values_list('id', 'name', 'description')
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    from reviews.search import drop_index
+
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_title_modified'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:53
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField
+import django.db.models.deletion
+
+LEADERBOARD_SIZE = 10
+
+
+def fill_leaderboards(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Leaderboard = apps.get_model('reviews', 'Leaderboard')
+    for field, name in (('category', 'Category'), ('genre', 'Genre')):
+        for group in apps.get_model('reviews', name).objects.all():
+            titles = Title.objects.filter(**{field: group})
+            group.titles_count = titles.count()
+            group.save(update_fields=['titles_count'])
+            rated = titles.filter(rating_count__gt=0)
+            boards = {
+                'rating': rated.annotate(value=ExpressionWrapper(
+                    F('rating_sum') * 1.0 / F('rating_count'),
+                    output_field=FloatField(),
+                )),
+                'reviews': rated.annotate(value=F('rating_count')),
+            }
+            Leaderboard.objects.bulk_create(
+                Leaderboard(**{field: group}, kind=kind, position=position,
+                            title_id=title_id, value=value)
+                for kind, queryset in boards.items()
+                for position, (title_id, value) in enumerate(
+                    queryset.order_by('-value', 'id').values_list(
+                        'id', 'value'
+                    )[:LEADERBOARD_SIZE],
+                    1
+                )
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0016_title_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='titles_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='количество произведений'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='titles_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='количество произведений'),
+        ),
+        migrations.CreateModel(
+            name='Leaderboard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('rating', 'по рейтингу'), ('reviews', 'по числу отзывов')], max_length=10, verbose_name='список')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='место')),
+                ('value', models.FloatField(verbose_name='значение')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='reviews.Category')),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='reviews.Genre')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.Title')),
+            ],
+            options={
+                'ordering': ['kind', 'position'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='leaderboard',
+            index=models.Index(fields=['category', 'kind', 'position'], name='leaderboard_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboard',
+            index=models.Index(fields=['genre', 'kind', 'position'], name='leaderboard_genre_idx'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
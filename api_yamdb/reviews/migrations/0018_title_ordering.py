@@ -0,0 +1,49 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:55
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField
+from django.db.models.functions import NullIf
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(rating=ExpressionWrapper(
+        F('rating_sum') * 1.0 / NullIf(F('rating_count'), 0),
+        output_field=FloatField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0017_leaderboards'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_year_idx',
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(editable=False, null=True, verbose_name='рейтинг'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'id'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating', 'id'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name', 'id'], name='title_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_count', 'id'], name='title_rating_count_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0018_title_ordering'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-rating', 'id'], name='title_category_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-rating_count', 'id'], name='title_category_count_idx'),
+        ),
+    ]
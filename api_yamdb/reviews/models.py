@@ -1,5 +1,6 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from reviews.deleting import deleting
 from users.models import User
 
 
@@ -14,6 +15,11 @@ class Category(models.Model):
         max_length=50,
         unique=True
     )
+    titles_count = models.PositiveIntegerField(
+        'количество произведений',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = ['id']
@@ -33,6 +39,11 @@ class Genre(models.Model):
         max_length=50,
         unique=True
     )
+    titles_count = models.PositiveIntegerField(
+        'количество произведений',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = ['id']
@@ -41,6 +52,10 @@ class Genre(models.Model):
         return self.name
 
 
+# Денормализованный рейтинг произведения
+RATING_FIELDS = ('rating_sum', 'rating_count', 'rating')
+
+
 class Title(models.Model):
     name = models.CharField(
         'название',
@@ -65,13 +80,74 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         related_name='titles',
     )
+    rating_sum = models.PositiveIntegerField(
+        'сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        'количество оценок',
+        default=0,
+        editable=False,
+    )
+    # Средняя оценка хранится, чтобы сортировка шла по индексу
+    rating = models.FloatField(
+        'рейтинг',
+        null=True,
+        editable=False,
+    )
+    modified = models.DateTimeField(
+        'дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            models.Index(fields=['year', 'id'], name='title_year_idx'),
+            models.Index(
+                fields=['category', 'id'],
+                name='title_category_id_idx'
+            ),
+            models.Index(fields=['rating', 'id'], name='title_rating_idx'),
+            models.Index(fields=['name', 'id'], name='title_name_idx'),
+            models.Index(
+                fields=['rating_count', 'id'],
+                name='title_rating_count_idx'
+            ),
+            # Пересчёт списков лучших в категории
+            models.Index(
+                fields=['category', '-rating', 'id'],
+                name='title_category_rating_idx'
+            ),
+            models.Index(
+                fields=['category', '-rating_count', 'id'],
+                name='title_category_count_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Счётчики оценок меняют только UPDATE из сигналов отзывов:
+        # обычное сохранение не перезаписывает их значениями,
+        # загруженными в начале запроса
+        if not args and not self._state.adding and (
+            kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        # Отзывы удаляются каскадом без пересчёта рейтинга
+        with deleting(titles=[self.pk]):
+            return super().delete(*args, **kwargs)
+
 
 class Review(models.Model):
     text = models.TextField()
@@ -97,10 +173,22 @@ class Review(models.Model):
                 name='unique_relationships'
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения пересчитывается в post_save,
+        # поэтому запись отзыва и рейтинга идут одной транзакцией
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     author = models.ForeignKey(
@@ -113,3 +201,57 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('id', )
+        indexes = [
+            models.Index(
+                fields=['review', 'id'],
+                name='comment_review_id_idx'
+            ),
+        ]
+
+
+class Leaderboard(models.Model):
+    # Готовые списки лучших произведений жанра или категории,
+    # обновляются сигналами при записи отзывов
+    RATING = 'rating'
+    REVIEWS = 'reviews'
+    KINDS = [
+        (RATING, 'по рейтингу'),
+        (REVIEWS, 'по числу отзывов'),
+    ]
+    category = models.ForeignKey(
+        Category,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='leaderboard',
+    )
+    genre = models.ForeignKey(
+        Genre,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='leaderboard',
+    )
+    kind = models.CharField(
+        'список',
+        max_length=10,
+        choices=KINDS,
+    )
+    position = models.PositiveSmallIntegerField('место')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    value = models.FloatField('значение')
+
+    class Meta:
+        ordering = ['kind', 'position']
+        indexes = [
+            models.Index(
+                fields=['category', 'kind', 'position'],
+                name='leaderboard_category_idx'
+            ),
+            models.Index(
+                fields=['genre', 'kind', 'position'],
+                name='leaderboard_genre_idx'
+            ),
+        ]
@@ -0,0 +1,120 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'reviews_title_fts'
+
+# Одно выражение используется и в индексе, и в запросе,
+# иначе PostgreSQL не сможет применить GIN-индекс
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple', coalesce(reviews_title.name, '')), 'A')"
+    " || setweight(to_tsvector('simple', "
+    "coalesce(reviews_title.description, '')), 'B'))"
+)
+
+WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def get_vendor(using=None):
+    return (using or connection).vendor
+
+
+def create_index(schema_editor):
+    vendor = get_vendor(schema_editor.connection)
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            'USING fts5(name, description, '
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS reviews_title_search_idx '
+            f'ON reviews_title USING GIN ({PG_VECTOR})'
+        )
+
+
+def drop_index(schema_editor):
+    vendor = get_vendor(schema_editor.connection)
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS reviews_title_search_idx')
+
+
+def index_titles(rows):
+    # rows: пары (id, name, description); PostgreSQL индексирует сам
+    if get_vendor() != 'sqlite':
+        return
+    rows = list(rows)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(row[0], ) for row in rows]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [(pk, name, description or '') for pk, name, description in rows]
+        )
+
+
+def unindex_titles(ids):
+    if get_vendor() != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(pk, ) for pk in ids]
+        )
+
+
+def rebuild_index(titles, batch_size=1000):
+    if get_vendor() != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    batch = []
+    rows = titles.order_by().values_list('id', 'name', 'description')
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            index_titles(batch)
+            batch = []
+    index_titles(batch)
+
+
+def search_titles(queryset, query):
+    words = WORD.findall(query)
+    if not words:
+        return queryset
+    vendor = get_vendor()
+    if vendor == 'sqlite':
+        # Каждое слово ищется как префикс: "гарри" "пот"*
+        match = ' '.join(f'"{word}"*' for word in words)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = reviews_title.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[match],
+            select={'search_rank': f'bm25({FTS_TABLE}, 10.0, 1.0)'},
+            order_by=['search_rank', 'id'],
+        )
+    if vendor == 'postgresql':
+        tsquery = "to_tsquery('simple', %s)"
+        match = ' & '.join(f'{word}:*' for word in words)
+        return queryset.extra(
+            where=[f'{PG_VECTOR} @@ {tsquery}'],
+            params=[match],
+            select={'search_rank': f'ts_rank({PG_VECTOR}, {tsquery})'},
+            select_params=[match],
+            order_by=['-search_rank', 'id'],
+        )
+    condition = Q()
+    for word in words:
+        condition &= (Q(name__icontains=word)
+                      | Q(description__icontains=word))
+    return queryset.filter(condition)
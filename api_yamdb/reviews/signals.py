@@ -0,0 +1,187 @@
+from django.db.models import ExpressionWrapper, F, FloatField, Q
+from django.db.models.functions import NullIf
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.deleting import get_deleting
+from reviews.leaderboards import (refresh_groups, title_groups,
+                                  update_leaderboards)
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import index_titles, unindex_titles
+from users.models import User
+
+
+def average_rating(rating_sum, rating_count):
+    # Без оценок рейтинг равен NULL
+    return ExpressionWrapper(
+        rating_sum * 1.0 / NullIf(rating_count, 0),
+        output_field=FloatField(),
+    )
+
+
+def update_rating(title_id, score_delta, count_delta):
+    # В UPDATE выражения видят старые значения столбцов
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=average_rating(rating_sum, rating_count),
+        modified=timezone.now(),
+    )
+
+
+def touch_titles(titles):
+    # Дата изменения произведения служит валидатором для ETag
+    # и Last-Modified у произведения, его отзывов и комментариев
+    titles.update(modified=timezone.now())
+
+
+@receiver(post_init, sender=Review)
+def remember_rating(sender, instance, **kwargs):
+    # Читаем __dict__, чтобы не подгружать отложенные поля
+    instance._rated = (
+        instance.__dict__.get('title_id'),
+        instance.__dict__.get('score'),
+    )
+
+
+@receiver(post_save, sender=Review)
+def apply_rating(sender, instance, created, **kwargs):
+    title_id, score = instance.title_id, instance.score
+    if created:
+        update_rating(title_id, score, 1)
+        update_leaderboards([title_id])
+    else:
+        old_title_id, old_score = instance._rated
+        if old_score is None:
+            touch_titles(Title.objects.filter(pk=title_id))
+            return
+        if old_title_id != title_id:
+            update_rating(old_title_id, -old_score, -1)
+            update_rating(title_id, score, 1)
+        else:
+            update_rating(title_id, score - old_score, 0)
+        update_leaderboards({old_title_id, title_id})
+    instance._rated = (title_id, score)
+
+
+@receiver(post_delete, sender=Review)
+def revoke_rating(sender, instance, **kwargs):
+    title_id, score = instance._rated
+    deleting = get_deleting()
+    if score is None or title_id in deleting.titles:
+        return
+    update_rating(title_id, -score, -1)
+    if instance.author_id in deleting.authors:
+        deleting.authors[instance.author_id].add(title_id)
+    else:
+        update_leaderboards([title_id])
+
+
+@receiver(post_delete, sender=User)
+def author_deleted(sender, instance, **kwargs):
+    title_ids = get_deleting().authors.pop(instance.pk, None)
+    if title_ids:
+        update_leaderboards(title_ids)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    touch_titles(Title.objects.filter(reviews=instance.review_id))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        touch_titles(Title.objects.filter(pk=instance.pk))
+    elif pk_set:
+        touch_titles(Title.objects.filter(pk__in=pk_set))
+    else:
+        touch_titles(Title.objects.filter(genre=instance))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, created=False, **kwargs):
+    # Название и slug категории входят в ответ о произведении
+    if not created:
+        touch_titles(Title.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def genre_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        touch_titles(Title.objects.filter(genre=instance))
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def username_changed(sender, instance, created, **kwargs):
+    # Имя автора входит в ответы со списками отзывов и комментариев
+    if not created and instance._username != instance.username:
+        touch_titles(Title.objects.filter(
+            Q(reviews__author=instance)
+            | Q(reviews__comments__author=instance)
+        ))
+    instance._username = instance.username
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, **kwargs):
+    index_titles([(instance.pk, instance.name, instance.description)])
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    unindex_titles([instance.pk])
+
+
+@receiver(post_init, sender=Title)
+def remember_category(sender, instance, **kwargs):
+    instance._category_id = instance.__dict__.get('category_id')
+
+
+@receiver(post_save, sender=Title)
+def title_category_changed(sender, instance, created, **kwargs):
+    # Число произведений и списки лучших хранятся у категорий и жанров
+    if created or instance._category_id != instance.category_id:
+        refresh_groups(
+            categories={instance._category_id, instance.category_id}
+        )
+    instance._category_id = instance.category_id
+
+
+@receiver(pre_delete, sender=Title)
+def remember_groups(sender, instance, **kwargs):
+    instance._groups = title_groups([instance.pk])
+
+
+@receiver(post_delete, sender=Title)
+def title_groups_changed(sender, instance, **kwargs):
+    refresh_groups(*instance._groups)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and not reverse:
+        instance._cleared_genres = set(
+            instance.genre.values_list('pk', flat=True)
+        )
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if reverse:
+            refresh_groups(genres=[instance.pk])
+        elif action == 'post_clear':
+            refresh_groups(genres=instance._cleared_genres)
+        else:
+            refresh_groups(genres=pk_set)
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        import users.signals  # noqa: F401
+        from users.authentication import check_version_store
+        check_version_store()
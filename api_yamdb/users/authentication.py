@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+
+# Поля пользователя, которые передаются в токене
+CLAIM_FIELDS = ('username', 'role', 'is_superuser', 'is_active')
+
+# Токен действителен без базы, пока его версия совпадает с
+# User.token_version: смена полей из CLAIM_FIELDS увеличивает версию
+VERSION_CLAIM = 'token_version'
+
+# user_id -> (момент устаревания записи, версия токенов или None)
+_versions = OrderedDict()
+_versions_lock = threading.Lock()
+
+
+def get_access_token(user):
+    token = AccessToken.for_user(user)
+    for field in CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def check_version_store():
+    # Общий кэш версий должен быть виден всем процессам сервера
+    alias = settings.STATELESS_JWT_CACHE_ALIAS
+    if (settings.STATELESS_JWT and alias
+            and isinstance(caches[alias], LocMemCache)):
+        raise ImproperlyConfigured(
+            f'STATELESS_JWT требует общего кэша: кэш {alias!r} хранится '
+            'в памяти одного процесса'
+        )
+
+
+def version_key(user_id):
+    return f'users:auth:token_version:{user_id}'
+
+
+def revoke_tokens(user_id):
+    # Вызывается после того, как версия в базе увеличена
+    with _versions_lock:
+        _versions.pop(user_id, None)
+    if settings.STATELESS_JWT_CACHE_ALIAS:
+        caches[settings.STATELESS_JWT_CACHE_ALIAS].delete(version_key(user_id))
+
+
+def load_token_version(user_id):
+    # Кэш лишь ускоряет чтение версии: при вытеснении записи она снова
+    # читается из базы, поэтому отзыв токенов не теряется
+    cache = None
+    if settings.STATELESS_JWT_CACHE_ALIAS:
+        cache = caches[settings.STATELESS_JWT_CACHE_ALIAS]
+        version = cache.get(version_key(user_id))
+        if version is not None:
+            return version
+    version = User.objects.filter(pk=user_id).values_list(
+        'token_version', flat=True
+    ).first()
+    if cache is not None and version is not None:
+        cache.set(
+            version_key(user_id), version,
+            int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+        )
+    return version
+
+
+def get_token_version(user_id):
+    now = time.monotonic()
+    with _versions_lock:
+        cached = _versions.get(user_id)
+        if cached is not None and cached[0] > now:
+            _versions.move_to_end(user_id)
+            return cached[1]
+    version = load_token_version(user_id)
+    with _versions_lock:
+        _versions[user_id] = (
+            now + settings.STATELESS_JWT_CACHE_TIMEOUT, version
+        )
+        _versions.move_to_end(user_id)
+        while len(_versions) > settings.STATELESS_JWT_MEMO_SIZE:
+            _versions.popitem(last=False)
+    return version
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    # В режиме STATELESS_JWT пользователь собирается из claims токена
+    # без запроса к таблице пользователей
+    def get_user(self, validated_token):
+        if not settings.STATELESS_JWT or any(
+            field not in validated_token
+            for field in (*CLAIM_FIELDS, VERSION_CLAIM)
+        ):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        if get_token_version(user_id) != validated_token[VERSION_CLAIM]:
+            # Токен отозван или пользователь удалён
+            return super().get_user(validated_token)
+        if not validated_token['is_active']:
+            raise AuthenticationFailed(
+                'User is inactive', code='user_inactive'
+            )
+        values = {api_settings.USER_ID_FIELD: user_id}
+        for field in CLAIM_FIELDS:
+            values[field] = validated_token[field]
+        # from_db ждёт значения в порядке полей модели, остальные поля
+        # отложены и подгрузятся из базы при обращении
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            router.db_for_read(User),
+            field_names,
+            [values[name] for name in field_names],
+        )
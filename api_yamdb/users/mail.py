@@ -0,0 +1,114 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EMAIL_OUTBOX_WORKERS,
+                thread_name_prefix='outbox',
+            )
+        return _executor
+
+
+def queue_mail(subject, message, recipient):
+    # Письмо сначала сохраняется в очередь, отправка идёт после коммита
+    email = OutgoingEmail.objects.create(
+        subject=subject, message=message, recipient=recipient
+    )
+    transaction.on_commit(lambda: dispatch(email.pk))
+    return email
+
+
+def dispatch(pk, delay=0):
+    if not settings.EMAIL_OUTBOX_ASYNC:
+        deliver(pk)
+    elif delay:
+        timer = threading.Timer(delay, dispatch, args=(pk, ))
+        timer.daemon = True
+        timer.start()
+    else:
+        get_executor().submit(deliver_in_thread, pk)
+
+
+def deliver_in_thread(pk):
+    try:
+        deliver(pk)
+    except Exception:
+        logger.exception('Не удалось обработать письмо %s', pk)
+    finally:
+        connection.close()
+
+
+def claim(pk):
+    now = timezone.now()
+    lease = timedelta(seconds=settings.EMAIL_OUTBOX_SENDING_TIMEOUT)
+    return OutgoingEmail.objects.filter(
+        pk=pk,
+        status__in=[OutgoingEmail.PENDING, OutgoingEmail.SENDING],
+        next_attempt__lte=now,
+    ).update(
+        status=OutgoingEmail.SENDING,
+        attempts=F('attempts') + 1,
+        next_attempt=now + lease,
+    )
+
+
+def deliver(pk):
+    if not claim(pk):
+        return False
+    email = OutgoingEmail.objects.get(pk=pk)
+    try:
+        send_mail(
+            subject=email.subject,
+            message=email.message,
+            from_email=None,
+            recipient_list=[email.recipient],
+        )
+    except Exception as error:
+        failed = email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+        OutgoingEmail.objects.filter(pk=pk).update(
+            status=OutgoingEmail.FAILED if failed else OutgoingEmail.PENDING,
+            next_attempt=timezone.now() + timedelta(seconds=delay),
+            last_error=str(error),
+        )
+        logger.warning(
+            'Письмо %s не отправлено (попытка %s): %s',
+            pk, email.attempts, error
+        )
+        if not failed:
+            dispatch(pk, delay)
+        return False
+    OutgoingEmail.objects.filter(pk=pk).update(
+        status=OutgoingEmail.SENT,
+        sent_at=timezone.now(),
+        last_error='',
+    )
+    return True
+
+
+def deliver_pending():
+    # Досылает письма, оставшиеся в очереди после перезапуска процесса
+    ready = OutgoingEmail.objects.filter(
+        status__in=[OutgoingEmail.PENDING, OutgoingEmail.SENDING],
+        next_attempt__lte=timezone.now(),
+    ).values_list('pk', flat=True)
+    return sum(deliver(pk) for pk in list(ready))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from users.mail import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди, которые ещё не доставлены'
+
+    def handle(self, *args, **options):
+        sent = deliver_pending()
+        self.stdout.write(self.style.SUCCESS(f'Отправлено писем: {sent}'))
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Увеличивается при смене данных, переданных в токене', verbose_name='Версия токенов'),
+        ),
+    ]
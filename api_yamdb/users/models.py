@@ -1,5 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
+
+from reviews.deleting import deleting
 
 
 class User(AbstractUser):
@@ -42,6 +45,12 @@ class User(AbstractUser):
         choices=USER_ROLES,
         default='user',
     )
+    token_version = models.PositiveIntegerField(
+        'Версия токенов',
+        help_text='Увеличивается при смене данных, переданных в токене',
+        default=0,
+        editable=False,
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
@@ -53,3 +62,72 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+    def delete(self, *args, **kwargs):
+        # Списки лучших обновятся один раз после удаления отзывов автора
+        with deleting(authors=[self.pk]):
+            return super().delete(*args, **kwargs)
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = [
+        (PENDING, 'pending'),
+        (SENDING, 'sending'),
+        (SENT, 'sent'),
+        (FAILED, 'failed'),
+    ]
+    subject = models.CharField(
+        'Тема',
+        max_length=255,
+    )
+    message = models.TextField(
+        'Текст письма',
+    )
+    recipient = models.EmailField(
+        'Получатель',
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток отправки',
+        default=0,
+    )
+    next_attempt = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True,
+    )
+    created = models.DateTimeField(
+        'Дата создания',
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        'Дата отправки',
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt'],
+                name='outgoing_email_queue_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
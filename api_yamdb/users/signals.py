@@ -0,0 +1,32 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from users.authentication import CLAIM_FIELDS, revoke_tokens
+from users.models import User
+
+
+def get_claims(instance):
+    return tuple(instance.__dict__.get(field) for field in CLAIM_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_claims(sender, instance, **kwargs):
+    instance._claims = get_claims(instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    claims = get_claims(instance)
+    if not created and claims != instance._claims:
+        User.objects.filter(pk=instance.pk).update(
+            token_version=F('token_version') + 1
+        )
+        instance.token_version += 1
+        revoke_tokens(instance.pk)
+    instance._claims = claims
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    revoke_tokens(instance.pk)
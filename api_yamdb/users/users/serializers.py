@@ -1,15 +1,22 @@
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
+
+from api.utils.serializers import UniqueConstraintSerializerMixin
+from api.utils.timing import TimedSerializerMixin
 from users.models import User
 
+# Уникальность username и email проверяется ограничениями БД при записи
+USER_UNIQUE_ERRORS = {
+    'username': ('username', UniqueValidator.message),
+    'email': ('email', UniqueValidator.message),
+}
+
 
-class SignUpSerializer(serializers.ModelSerializer):
-    username = serializers.CharField(
-        validators=[UniqueValidator(queryset=User.objects.all())]
-    )
-    email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())]
-    )
+class SignUpSerializer(UniqueConstraintSerializerMixin,
+                       serializers.ModelSerializer):
+    username = serializers.CharField()
+    email = serializers.EmailField()
+    unique_errors = USER_UNIQUE_ERRORS
 
     def validate_username(self, value):
         if value.lower() == 'me':
@@ -28,14 +35,11 @@ class TokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField(required=True)
 
 
-class UserSerializer(serializers.ModelSerializer):
-    username = serializers.CharField(
-        validators=[UniqueValidator(queryset=User.objects.all())],
-        required=True,
-    )
-    email = serializers.EmailField(
-        validators=[UniqueValidator(queryset=User.objects.all())]
-    )
+class UserSerializer(UniqueConstraintSerializerMixin, TimedSerializerMixin,
+                     serializers.ModelSerializer):
+    username = serializers.CharField(required=True)
+    email = serializers.EmailField()
+    unique_errors = USER_UNIQUE_ERRORS
 
     class Meta:
         fields = ('username', 'email', 'first_name',
@@ -1,7 +1,6 @@
 from http.client import BAD_REQUEST, OK
 
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
@@ -9,8 +8,10 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 
+from api.writes import write_queue
+from users.authentication import get_access_token
+from users.mail import queue_mail
 from users.models import User
 from users.users.serializers import (SignUpSerializer, TokenSerializer,
                                      UserSerializer)
@@ -23,21 +24,20 @@ from users.utils.httpmethod import HTTPMethod
 def singup(request):
     serializer = SignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    serializer.save()
-    user = get_object_or_404(
-        User,
-        username=serializer.validated_data["username"]
-    )
+    write_queue.submit(lambda: register(serializer))
+    return Response(serializer.data, status=OK)
+
+
+def register(serializer):
+    # Пользователь и письмо с кодом сохраняются одной записью
+    user = serializer.save()
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
+    queue_mail(
         subject="Регистрация на YamDB",
         message=f"Код для токена: {confirmation_code}",
-        from_email=None,
-        recipient_list=[user.email],
+        recipient=user.email,
     )
 
-    return Response(serializer.data, status=OK)
-
 
 @api_view(["POST"])
 @permission_classes([permissions.AllowAny])
@@ -51,7 +51,7 @@ def token_jwt(request):
     if default_token_generator.check_token(
         user, serializer.validated_data["confirmation_code"]
     ):
-        token = AccessToken.for_user(user)
+        token = get_access_token(user)
         return Response({"token": str(token)}, status=OK)
 
     return Response(serializer.errors, status=BAD_REQUEST)
@@ -70,7 +70,11 @@ class UserViewSet(viewsets.ModelViewSet):
             methods=[HTTPMethod.GET.value, HTTPMethod.PATCH.value, ],
             permission_classes=[IsAuthenticated, ])
     def me(self, request):
-        serializer = UserSerializer(request.user,
+        user = request.user
+        if user.get_deferred_fields():
+            # В режиме STATELESS_JWT пользователь собран из токена
+            user = User.objects.get(pk=user.pk)
+        serializer = UserSerializer(user,
                                     data=request.data,
                                     partial=True)
         if request.user.role == 'admin' or request.user.role == 'moderator':
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def sync_mail_outbox(settings):
+    # Письма отправляются сразу после коммита, без фоновых потоков
+    settings.EMAIL_OUTBOX_ASYNC = False
@@ -0,0 +1,80 @@
+import pytest
+from django.core.management import call_command
+from django.db.models.signals import pre_save
+
+from .common import auth_client, create_reviews
+
+
+class Test08RatingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_on_delete(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') == 4, (
+            'Проверьте, что `rating` произведения считается по всем отзывам'
+        )
+        client_moderator = auth_client(moderator)
+        client_moderator.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') == 3, (
+            'Проверьте, что при удалении отзыва `rating` произведения пересчитывается'
+        )
+        user.delete()
+        moderator.delete()
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') is None, (
+            'Проверьте, что `rating` произведения без отзывов равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings(self, admin_client, admin):
+        from reviews.models import Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0)
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_save_keeps_rating(self, admin_client, admin):
+        from reviews.models import Review, Title
+
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        title_id = titles[1]['id']
+
+        def review_behind(sender, instance, **kwargs):
+            # Отзыв записан между загрузкой произведения и его сохранением
+            pre_save.disconnect(review_behind, sender=Title)
+            Review.objects.create(
+                title_id=title_id, author=user, text='Отзыв', score=8
+            )
+
+        pre_save.connect(review_behind, sender=Title)
+        try:
+            response = admin_client.patch(
+                f'/api/v1/titles/{title_id}/', data={'name': 'Новое имя'}
+            )
+        finally:
+            pre_save.disconnect(review_behind, sender=Title)
+        assert response.status_code == 200
+        title = Title.objects.get(pk=title_id)
+        assert title.name == 'Новое имя'
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            8, 1, 8
+        ), (
+            'Проверьте, что изменение произведения не перезаписывает '
+            'рейтинг, пересчитанный другим запросом'
+        )
+        response = auth_client(user).delete(
+            f'/api/v1/titles/{title_id}/reviews/'
+            f'{title.reviews.get().id}/'
+        )
+        assert response.status_code == 204
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating) == (0, None)
@@ -0,0 +1,87 @@
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+from .common import create_categories, create_genre
+
+
+def create_many_titles(admin_client, count):
+    genres = create_genre(admin_client)
+    categories = create_categories(admin_client)
+    ids = []
+    for i in range(count):
+        data = {
+            'name': f'Произведение {i}',
+            'year': 2000 + i,
+            'genre': [genre['slug'] for genre in genres],
+            'category': categories[i % len(categories)]['slug'],
+        }
+        response = admin_client.post('/api/v1/titles/', data=data)
+        ids.append(response.json()['id'])
+    return ids
+
+
+def bulk_create_titles(count):
+    from reviews.models import Category, Genre, Title
+
+    Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(3)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(3)
+    )
+    categories = list(Category.objects.all())
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000,
+              category=categories[i % len(categories)])
+        for i in range(count)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title_id, genre_id=genre.id)
+        for title_id in Title.objects.values_list('id', flat=True)
+        for genre in genres
+    )
+
+
+class Test09TitleQueries:
+
+    @pytest.mark.parametrize('count', [1, 3, 12])
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_queries(self, client, admin_client, count,
+                                   django_assert_num_queries):
+        create_many_titles(admin_client, count)
+        # Валидаторы ETag, COUNT для пагинации,
+        # произведения с категориями, жанры
+        with django_assert_num_queries(4):
+            response = client.get('/api/v1/titles/')
+        assert len(response.json()['results']) == min(count, 5), (
+            'Проверьте, что при GET запросе `/api/v1/titles/` '
+            'возвращаются все произведения страницы'
+        )
+
+    @pytest.mark.parametrize('page_size', [5, 50, 500])
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_list_page_size(self, client, page_size, monkeypatch,
+                                     django_assert_num_queries):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        bulk_create_titles(page_size + 3)
+        with django_assert_num_queries(4):
+            response = client.get('/api/v1/titles/')
+        results = response.json()['results']
+        assert len(results) == page_size, (
+            'Проверьте, что число запросов к `/api/v1/titles/` '
+            'не зависит от размера страницы'
+        )
+        assert all(len(title['genre']) == 3 for title in results)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(self, client, admin_client,
+                                     django_assert_num_queries):
+        ids = create_many_titles(admin_client, 2)
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/{ids[0]}/')
+        assert len(response.json()['genre']) == 3, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` '
+            'возвращаются жанры произведения'
+        )
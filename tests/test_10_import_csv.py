@@ -0,0 +1,81 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+
+class Test10ImportCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_csv(self):
+        from reviews.models import Comment, Review, Title
+
+        call_command('import_csv', batch_size=7)
+        assert Title.objects.count() == 32, (
+            'Проверьте, что команда `import_csv` загружает произведения'
+        )
+        assert Review.objects.count() == 72, (
+            'Проверьте, что команда `import_csv` загружает отзывы'
+        )
+        assert Comment.objects.count() == 3, (
+            'Проверьте, что команда `import_csv` загружает комментарии'
+        )
+        title = Title.objects.get(pk=1)
+        assert title.genre.exists(), (
+            'Проверьте, что команда `import_csv` загружает жанры произведений'
+        )
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после импорта рейтинг произведений пересчитан'
+        )
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Проверьте, что команда `import_csv` сохраняет `pub_date` из файла'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_import_csv_invalid(self, tmp_path):
+        from reviews.models import Category
+
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n2,Книга,book\n', encoding='utf-8'
+        )
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year,category\n1,Побег,1994,3\n', encoding='utf-8'
+        )
+        with pytest.raises(CommandError):
+            call_command('import_csv', path=str(tmp_path))
+        assert not Category.objects.exists(), (
+            'Проверьте, что при ошибке импорт откатывается целиком'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_import_csv_duplicate(self, tmp_path):
+        from reviews.models import Category
+
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Фильм,movie\n2,Книга,book\n3,Кино,movie\n',
+            encoding='utf-8',
+        )
+        with pytest.raises(CommandError, match=r'category\.csv, строка 4'):
+            call_command('import_csv', path=str(tmp_path), batch_size=2)
+        assert not Category.objects.exists(), (
+            'Проверьте, что при нарушении уникальности импорт откатывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_import_csv_duplicate_review(self, tmp_path):
+        from reviews.models import Review
+
+        (tmp_path / 'users.csv').write_text(
+            'id,username,email\n1,reader,reader@yamdb.fake\n',
+            encoding='utf-8',
+        )
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year\n1,Побег,1994\n', encoding='utf-8'
+        )
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            '1,1,Отзыв,1,8,2019-09-24T21:08:21.567Z\n'
+            '2,1,Ещё отзыв,1,9,2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8',
+        )
+        with pytest.raises(CommandError, match=r'review\.csv, строка 3'):
+            call_command('import_csv', path=str(tmp_path))
+        assert not Review.objects.exists()
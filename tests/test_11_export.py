@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+import pytest
+
+from .common import create_reviews
+
+
+class Test11ExportAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_permissions(self, client, user_client, admin_client):
+        response = client.get('/api/v1/export/titles/')
+        assert response.status_code == 401, (
+            'Проверьте, что выгрузка недоступна без токена'
+        )
+        response = user_client.get('/api/v1/export/titles/')
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка недоступна обычному пользователю'
+        )
+        response = admin_client.get('/api/v1/export/users/')
+        assert response.status_code == 404, (
+            'Проверьте, что для неизвестной выгрузки возвращается статус 404'
+        )
+        response = admin_client.get('/api/v1/export/titles/?output=xml')
+        assert response.status_code == 400, (
+            'Проверьте, что для неизвестного формата возвращается статус 400'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_ndjson(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.get('/api/v1/export/reviews/')
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком'
+        )
+        content = b''.join(response.streaming_content).decode()
+        rows = [json.loads(line) for line in content.splitlines()]
+        assert [row['id'] for row in rows] == sorted(
+            review['id'] for review in reviews
+        )
+        assert rows[0]['author__username'] == admin.username
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_csv(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.get('/api/v1/export/titles/?output=csv')
+        assert response['Content-Type'].startswith('text/csv')
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == len(titles)
+        assert rows[0]['rating_count'] == '3'
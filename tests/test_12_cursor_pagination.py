@@ -0,0 +1,116 @@
+from base64 import b64encode
+from urllib.parse import urlencode
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Review
+from users.models import User
+
+from .common import create_comments, create_reviews
+
+
+class Test12CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_cursor(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        assert 'count' in response.json(), (
+            'Проверьте, что по умолчанию отзывы отдаются с постраничной пагинацией'
+        )
+        response = client.get(url, {'pagination': 'cursor'})
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при `?pagination=cursor` не выполняется подсчёт отзывов'
+        )
+        assert [review['id'] for review in data['results']] == [
+            review['id'] for review in reversed(reviews)
+        ], (
+            'Проверьте, что курсорная пагинация отдаёт новые отзывы первыми'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_cursor(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        for i in range(4):
+            admin_client.post(url, data={'text': f'comment {i}'})
+        ids = []
+        next_url = f'{url}?pagination=cursor'
+        while next_url:
+            data = client.get(next_url).json()
+            ids.extend(comment['id'] for comment in data['results'])
+            next_url = data['next']
+        assert len(ids) == 7 and ids == sorted(ids), (
+            'Проверьте, что курсорная пагинация комментариев проходит все '
+            'страницы по возрастанию `id`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_cursor_same_pub_date(self, client, admin_client,
+                                            admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title = titles[0]['id']
+        for number in range(9):
+            user = User.objects.create(
+                username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+            )
+            Review.objects.create(
+                title_id=title, author=user, text='Отзыв', score=5
+            )
+        Review.objects.filter(title_id=title).update(
+            pub_date=timezone.now()
+        )
+        expected = list(Review.objects.filter(
+            title_id=title
+        ).order_by('-id').values_list('id', flat=True))
+        url = f'/api/v1/titles/{title}/reviews/?pagination=cursor'
+        ids, pages = [], []
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                data = client.get(url).json()
+                pages.append(data)
+                ids.extend(review['id'] for review in data['results'])
+                url = data['next']
+        assert ids == expected, (
+            'Проверьте, что отзывы с одинаковой датой проходятся курсором '
+            'без пропусков и повторов'
+        )
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if 'OFFSET' in query['sql']
+        ], 'Проверьте, что следующая страница выбирается без смещения'
+        previous = client.get(pages[-1]['previous']).json()
+        assert previous['results'] == pages[-2]['results'], (
+            'Проверьте, что ссылка на предыдущую страницу ведёт назад'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_malformed_cursor(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title, review = titles[0]['id'], reviews[0]['id']
+        cases = (
+            (f'/api/v1/titles/{title}/reviews/',
+             ('["garbage", "x"]', '["2020-01-01T00:00:00+00:00", "x"]',
+              '[null, null]', '[{}, []]', '["x"]')),
+            (f'/api/v1/titles/{title}/reviews/{review}/comments/',
+             ('["abc"]', '[null]', '[[1]]', '[1, 2]', 'abc')),
+        )
+        for url, positions in cases:
+            for position in positions:
+                cursor = b64encode(
+                    urlencode({'o': 0, 'p': position}).encode()
+                ).decode()
+                response = client.get(
+                    url, {'pagination': 'cursor', 'cursor': cursor}
+                )
+                assert response.status_code == 404, (
+                    'Проверьте, что некорректная позиция курсора '
+                    f'{position} возвращает статус 404'
+                )
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db import connection
+
+HOT_QUERIES = (
+    'reviews', 'reviews cursor', 'comments', 'comments cursor',
+    'titles by year', 'titles by category', 'titles by genre',
+)
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def hot_query(name):
+    from reviews.models import Comment, Review, Title
+
+    return {
+        'reviews': Review.objects.filter(title_id=1).order_by('-pub_date'),
+        'reviews cursor': Review.objects.filter(
+            title_id=1, pub_date__lt=datetime(2020, 1, 1, tzinfo=timezone.utc)
+        ).order_by('-pub_date', '-id'),
+        'comments': Comment.objects.filter(review_id=1).order_by('id'),
+        'comments cursor': Comment.objects.filter(
+            review_id=1, id__gt=10
+        ).order_by('id'),
+        'titles by year': Title.objects.filter(year=2000).order_by('id'),
+        'titles by category': Title.objects.filter(
+            category__slug='films'
+        ).order_by('id'),
+        'titles by genre': Title.objects.filter(
+            genre__slug='drama'
+        ).order_by('id'),
+    }[name]
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='EXPLAIN QUERY PLAN проверяется только на SQLite'
+)
+class Test13QueryPlans:
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('name', HOT_QUERIES)
+    def test_01_hot_query_uses_index(self, name):
+        plan = query_plan(hot_query(name))
+        scans = [step for step in plan if step.startswith('SCAN')]
+        assert not scans, (
+            f'Проверьте, что запрос `{name}` использует индекс, '
+            f'а не полный просмотр таблицы: {plan}'
+        )
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('ordering', (
+        'rating', '-rating', 'year', '-year', 'name', '-review_count',
+    ))
+    def test_02_title_ordering_uses_index(self, ordering):
+        from api.utils.filters import TitleFilter
+        from reviews.models import Title
+
+        queryset = TitleFilter(
+            {'ordering': ordering}, queryset=Title.objects.all()
+        ).qs[:10]
+        plan = query_plan(queryset)
+        assert not [step for step in plan if 'TEMP B-TREE' in step], (
+            f'Проверьте, что сортировка `{ordering}` идёт по индексу, '
+            f'без сортировки всей таблицы: {plan}'
+        )
@@ -0,0 +1,55 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test14CatalogueCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_cached_title_list(self, client, admin_client,
+                                  django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        first = client.get('/api/v1/titles/')
+        with django_assert_num_queries(0):
+            second = client.get('/api/v1/titles/')
+        assert second.json() == first.json(), (
+            'Проверьте, что повторный GET запрос `/api/v1/titles/` '
+            'отдаётся из кэша'
+        )
+        urls = (f'/api/v1/titles/{titles[0]["id"]}/', '/api/v1/categories/')
+        for url in urls:
+            client.get(url)
+        with django_assert_num_queries(0):
+            for url in urls:
+                client.get(url)
+        response = client.get('/api/v1/titles/?year=2020')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что ключ кэша учитывает параметры запроса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cache_invalidation(self, client, admin_client, admin):
+        titles, _, _ = create_titles(admin_client)
+        assert client.get('/api/v1/titles/').json()['count'] == 2
+        assert client.get('/api/v1/genres/').json()['count'] == 3
+        admin_client.post('/api/v1/genres/', data={'name': 'Рок', 'slug': 'rock'})
+        assert client.get('/api/v1/genres/').json()['count'] == 4, (
+            'Проверьте, что при добавлении жанра кэш сбрасывается'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert client.get('/api/v1/titles/').json()['count'] == 1, (
+            'Проверьте, что при удалении произведения кэш сбрасывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_cache_invalidation_on_review(self, client, admin_client,
+                                             admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] == 4
+        admin_client.patch(
+            f'{url}reviews/{reviews[0]["id"]}/', data={'score': 8}
+        )
+        assert client.get(url).json()['rating'] == 5, (
+            'Проверьте, что при изменении отзыва рейтинг в кэше обновляется'
+        )
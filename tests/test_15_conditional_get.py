@@ -0,0 +1,102 @@
+import pytest
+
+from reviews.models import Category, Genre
+
+from .common import auth_client, create_comments, create_reviews
+
+
+class Test15ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_etag(self, client, admin_client, admin,
+                             user_superuser_client):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response.has_header('Last-Modified'), (
+            'Проверьте, что список отзывов отдаётся с ETag и Last-Modified'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304 and not response.content, (
+            'Проверьте, что при совпадении ETag возвращается статус 304'
+        )
+        user_superuser_client.post(url, data={'text': 'Новый', 'score': 2})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после нового отзыва ETag списка меняется'
+        )
+        etag = response['ETag']
+        admin_client.patch(
+            f'{url}{reviews[0]["id"]}/', data={'text': 'Исправлено'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения текста отзыва ETag меняется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_etag(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        admin_client.delete(f'{url}{comments[0]["id"]}/')
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            'Проверьте, что после удаления комментария ETag меняется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_titles_etag(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        response = client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == 304
+        list_etag = client.get('/api/v1/titles/')['ETag']
+        admin_client.patch(url, data={'name': 'Новое название'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        response = client.get('/api/v1/titles/', HTTP_IF_NONE_MATCH=list_etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения произведения ETag списка меняется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_author_rename(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        etags = [client.get(url)['ETag'] for url in (reviews_url,
+                                                     comments_url)]
+        response = auth_client(user).patch(
+            '/api/v1/users/me/', data={'username': 'renamed'}
+        )
+        assert response.status_code == 200
+        for url, etag in zip((reviews_url, comments_url), etags):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                'Проверьте, что после смены имени автора ETag списков '
+                'отзывов и комментариев меняется'
+            )
+        assert 'renamed' in response.content.decode()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_category_and_genre_rename(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        for model in (Category, Genre):
+            etag = client.get(url)['ETag']
+            group = model.objects.filter(titles=titles[0]['id']).first()
+            group.name = 'Новое название'
+            group.save()
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                'Проверьте, что после изменения категории или жанра '
+                'ETag произведения меняется'
+            )
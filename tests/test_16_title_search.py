@@ -0,0 +1,49 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test16TitleSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'search': 'драма'})
+        assert response.status_code == 200
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [titles[1]['id']], (
+            'Проверьте, что `search` ищет по описанию произведения '
+            'без учёта регистра'
+        )
+        response = client.get('/api/v1/titles/', {'search': 'пово'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что `search` ищет по началу слова в названии'
+        )
+        response = client.get(
+            '/api/v1/titles/', {'search': 'драма', 'year': 2000}
+        )
+        assert response.json()['count'] == 0, (
+            'Проверьте, что `search` сочетается с фильтрами'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_ranking_and_sync(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            data={'description': 'Проект без названия'}
+        )
+        response = client.get('/api/v1/titles/', {'search': 'проект'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что совпадение в названии ранжируется выше, '
+            'чем в описании, и индекс обновляется при изменении'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        response = client.get('/api/v1/titles/', {'search': 'проект'})
+        assert response.json()['count'] == 1
+        response = client.get('/api/v1/titles/', {'search': '"*) OR ('})
+        assert response.status_code == 200, (
+            'Проверьте, что спецсимволы в `search` не ломают запрос'
+        )
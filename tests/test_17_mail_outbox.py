@@ -0,0 +1,67 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+
+class Test17MailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_async_signup(self, client, settings):
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX_ASYNC = True
+        data = {'username': 'async_user', 'email': 'async@yamdb.fake'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        deadline = time.monotonic() + 5
+        while not mail.outbox and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(mail.outbox) == 1 and mail.outbox[0].to == [data['email']], (
+            'Проверьте, что письмо с кодом отправляется в фоновом потоке'
+        )
+        email = OutgoingEmail.objects.get(recipient=data['email'])
+        deadline = time.monotonic() + 5
+        while email.status != OutgoingEmail.SENT and time.monotonic() < deadline:
+            time.sleep(0.05)
+            email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_retry(self, monkeypatch, settings):
+        from users import mail as outbox
+        from users.models import OutgoingEmail
+
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        dispatched = []
+        monkeypatch.setattr(
+            outbox, 'dispatch', lambda pk, delay=0: dispatched.append(delay)
+        )
+
+        def broken_send_mail(**kwargs):
+            raise ConnectionError('SMTP недоступен')
+
+        monkeypatch.setattr(outbox, 'send_mail', broken_send_mail)
+        email = outbox.queue_mail('Тема', 'Текст', 'retry@yamdb.fake')
+        assert not outbox.deliver(email.pk)
+        email.refresh_from_db()
+        assert (email.status, email.attempts) == (OutgoingEmail.PENDING, 1), (
+            'Проверьте, что после ошибки письмо остаётся в очереди'
+        )
+        assert email.last_error and dispatched[-1] > 0, (
+            'Проверьте, что повторная отправка запланирована с задержкой'
+        )
+        assert not outbox.deliver(email.pk), (
+            'Проверьте, что письмо не отправляется раньше времени повтора'
+        )
+
+        monkeypatch.undo()
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            next_attempt=timezone.now() - timedelta(seconds=1)
+        )
+        assert outbox.deliver_pending() == 1
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.SENT and email.attempts == 2
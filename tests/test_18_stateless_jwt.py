@@ -0,0 +1,119 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+def token_client(client, user):
+    from users.authentication import get_access_token
+
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}'
+    )
+    return client
+
+
+class Test18StatelessJWT:
+
+    @pytest.fixture(autouse=True)
+    def stateless(self, settings):
+        from users import authentication
+
+        settings.STATELESS_JWT = True
+        settings.STATELESS_JWT_CACHE_TIMEOUT = 60
+        authentication._versions.clear()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_token_claims(self, client, admin):
+        from django.contrib.auth.tokens import default_token_generator
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        code = default_token_generator.make_token(admin)
+        response = client.post('/api/v1/auth/token/', data={
+            'username': admin.username, 'confirmation_code': code
+        })
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == 'admin' and token['username'] == admin.username, (
+            'Проверьте, что роль и имя пользователя передаются в токене'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_no_user_query(self, admin):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        client = token_client(APIClient(), admin)
+        # Версия токенов читается из базы один раз и запоминается
+        client.get('/api/v1/categories/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == 201
+        assert not [
+            query for query in context.captured_queries
+            if 'users_user' in query['sql']
+        ], (
+            'Проверьте, что права администратора берутся из токена '
+            'без запроса пользователя из базы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_role_change_revokes(self, admin, user):
+        admin_client = token_client(APIClient(), admin)
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        admin.save()
+        assert admin_client.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что после смены роли старый токен не даёт прежних прав'
+        )
+        user_client = token_client(APIClient(), user)
+        user.delete()
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что токен удалённого пользователя недействителен'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_me(self, user):
+        client = token_client(APIClient(), user)
+        response = client.patch('/api/v1/users/me/', data={'bio': 'new bio'})
+        assert response.status_code == 200
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `me` работает с полным профилем пользователя'
+        )
+        user.refresh_from_db()
+        assert user.bio == 'new bio' and user.email
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_version_memo_bounded(self, settings, admin, user, moderator):
+        from users import authentication
+
+        settings.STATELESS_JWT_MEMO_SIZE = 2
+        for member in (admin, user, moderator):
+            assert authentication.get_token_version(member.pk) == 0
+        assert list(authentication._versions) == [user.pk, moderator.pk], (
+            'Проверьте, что процесс помнит ограниченное число версий'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_shared_version_store(self, settings, admin):
+        from django.core.cache import cache
+        from django.core.exceptions import ImproperlyConfigured
+        from users.authentication import check_version_store
+
+        settings.CACHES = {
+            **settings.CACHES,
+            'auth': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'auth',
+            },
+        }
+        settings.STATELESS_JWT_CACHE_ALIAS = 'auth'
+        with pytest.raises(ImproperlyConfigured):
+            check_version_store()
+        settings.STATELESS_JWT_CACHE_ALIAS = None
+        check_version_store()
+        # Отзыв хранится в базе и не теряется при вытеснении из кэша
+        client = token_client(APIClient(), admin)
+        admin.role = 'user'
+        admin.save()
+        cache.clear()
+        assert client.get('/api/v1/users/').status_code == 403
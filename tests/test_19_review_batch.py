@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test19ReviewBatch:
+    url = '/api/v1/reviews/batch/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_batch_create(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        data = [
+            {'title': titles[0]['id'], 'text': 'Первый', 'score': 8},
+            {'title': titles[1]['id'], 'text': 'Второй', 'score': 3},
+            {'title': titles[0]['id'], 'text': 'Повтор', 'score': 1},
+            {'title': 100500, 'text': 'Нет такого', 'score': 5},
+            {'title': titles[1]['id'], 'text': 'Оценка', 'score': 11},
+        ]
+        response = client.post(
+            self.url, data=json.dumps(data), content_type='application/json'
+        )
+        assert response.status_code == 401
+        response = user_client.post(self.url, data=data, format='json')
+        assert response.status_code == 200
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 201, 400, 400, 400
+        ], (
+            'Проверьте, что результат возвращается для каждого отзыва, '
+            'а повторный отзыв на произведение не создаётся'
+        )
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{results[0]["id"]}/'
+        )
+        assert response.json()['text'] == 'Первый', (
+            'Проверьте, что созданные отзывы доступны по возвращённому `id`'
+        )
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert response.json()['rating'] == 3, (
+            'Проверьте, что пакетная загрузка обновляет рейтинг произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batch_existing_review(self, admin_client, admin,
+                                      django_assert_max_num_queries):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        data = [
+            {'title': titles[0]['id'], 'text': 'Уже есть', 'score': 2},
+            {'title': titles[1]['id'], 'text': 'Новый', 'score': 9},
+        ]
+        response = admin_client.post(self.url, data=data, format='json')
+        assert [result['status'] for result in response.json()] == [400, 201]
+        data = [{'title': titles[1]['id'], 'text': 'x', 'score': 5}] * 50
+        with django_assert_max_num_queries(10):
+            response = admin_client.post(self.url, data=data, format='json')
+        assert all(result['status'] == 400 for result in response.json()), (
+            'Проверьте, что уникальность проверяется одним запросом на пакет'
+        )
+        response = admin_client.post(self.url, data={'title': 1}, format='json')
+        assert response.status_code == 400
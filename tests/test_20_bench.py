@@ -0,0 +1,24 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+class Test20Bench:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bench_report(self, tmp_path):
+        output = tmp_path / 'bench.json'
+        call_command(
+            'bench', titles=5, reviews=12, comments=4, iterations=2,
+            current_db=True, output=str(output)
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert set(report['scenarios']) == {
+            'title_list', 'title_filter', 'title_detail', 'review_list',
+            'comment_list', 'signup', 'token',
+        }, 'Проверьте, что `bench` замеряет все основные сценарии'
+        for name, result in report['scenarios'].items():
+            assert result['status'] < 400, name
+            assert {'p50', 'p90', 'p99'} <= set(result['latency_ms'])
+            assert result['queries']['max'] > 0
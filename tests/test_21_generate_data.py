@@ -0,0 +1,66 @@
+import csv
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from reviews.models import Comment, Genre, Review, Title
+from users.models import User
+
+PARAMS = {
+    'seed': 7, 'users': 30, 'categories': 3, 'genres': 5, 'titles': 20,
+    'reviews': 200, 'comments': 50,
+}
+
+
+class Test21GenerateData:
+
+    def test_01_csv_is_deterministic(self, tmp_path):
+        call_command('generate_data', csv=str(tmp_path / 'a'), **PARAMS)
+        call_command('generate_data', csv=str(tmp_path / 'b'), **PARAMS)
+        call_command(
+            'generate_data', csv=str(tmp_path / 'c'), **{**PARAMS, 'seed': 8}
+        )
+        for filename in ('users.csv', 'titles.csv', 'review.csv'):
+            first = (tmp_path / 'a' / filename).read_bytes()
+            assert first == (tmp_path / 'b' / filename).read_bytes(), (
+                'Проверьте, что при одном seed данные совпадают'
+            )
+        assert (
+            (tmp_path / 'a' / 'review.csv').read_bytes()
+            != (tmp_path / 'c' / 'review.csv').read_bytes()
+        ), 'Проверьте, что seed влияет на данные'
+        with open(tmp_path / 'a' / 'review.csv', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        assert len(rows) == PARAMS['reviews']
+        pairs = {(row['title_id'], row['author']) for row in rows}
+        assert len(pairs) == len(rows), (
+            'Проверьте, что у пары (произведение, автор) один отзыв'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_csv_can_be_imported(self, tmp_path):
+        call_command('generate_data', csv=str(tmp_path), **PARAMS)
+        call_command('import_csv', path=str(tmp_path))
+        assert Review.objects.count() == PARAMS['reviews']
+        assert Comment.objects.count() == PARAMS['comments']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_database_skewed(self):
+        call_command('generate_data', **PARAMS)
+        assert User.objects.count() == PARAMS['users']
+        assert Genre.objects.count() == PARAMS['genres']
+        assert Review.objects.count() == PARAMS['reviews']
+        counts = sorted(
+            Title.objects.values_list('rating_count', flat=True), reverse=True
+        )
+        assert len(counts) == PARAMS['titles']
+        assert counts[0] >= 4 * counts[len(counts) // 2], (
+            'Проверьте, что отзывы распределены по популярности неравномерно'
+        )
+        assert Title.objects.annotate(
+            genres=Count('genre')
+        ).filter(genres=0).count() == 0
+        # Повторный запуск дописывает данные к уже существующим
+        call_command('generate_data', **{**PARAMS, 'prefix': 'more'})
+        assert Review.objects.count() == 2 * PARAMS['reviews']
@@ -0,0 +1,79 @@
+import re
+
+import pytest
+from django.test import override_settings
+
+from api.metrics import reset
+
+from .common import create_titles
+
+
+class Test22RequestMetrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_disabled_by_default(self, client):
+        response = client.get('/api/v1/genres/')
+        assert 'Server-Timing' not in response
+        assert client.get('/api/v1/metrics/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(REQUEST_METRICS=True)
+    def test_02_server_timing(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        header = response['Server-Timing']
+        match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', header)
+        assert match and int(match.group(1)) > 0, (
+            'Проверьте, что заголовок `Server-Timing` содержит число '
+            'запросов к базе и время SQL'
+        )
+        assert re.search(r'serializer;dur=[\d.]+', header)
+        assert re.search(r'total;dur=[\d.]+', header)
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(REQUEST_METRICS=True)
+    def test_03_prometheus_histograms(self, admin_client):
+        create_titles(admin_client)
+        reset()
+        for _ in range(3):
+            admin_client.get('/api/v1/titles/')
+        response = admin_client.get('/api/v1/metrics/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        assert '# TYPE yamdb_request_duration_seconds histogram' in text
+        assert (
+            'yamdb_request_duration_seconds_count{route="title-list"} 3'
+            in text
+        ), 'Проверьте, что гистограммы собираются по имени маршрута'
+        label = '{route="title-list",le="+Inf"}'
+        assert f'yamdb_request_queries_bucket{label} 3' in text
+        assert 'yamdb_request_serializer_seconds_sum{route="title-list"}' in (
+            text
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(REQUEST_METRICS=True)
+    def test_04_metrics_access(self, client, user_client, admin_client):
+        url = '/api/v1/metrics/'
+        assert client.get(url).status_code == 401, (
+            'Проверьте, что метрики недоступны анонимному пользователю'
+        )
+        assert user_client.get(url).status_code == 403, (
+            'Проверьте, что метрики недоступны обычному пользователю'
+        )
+        assert admin_client.get(url).status_code == 200
+        with override_settings(REQUEST_METRICS_TOKEN='scrape-token'):
+            response = client.get(
+                url, HTTP_AUTHORIZATION='Bearer scrape-token'
+            )
+            assert response.status_code == 200, (
+                'Проверьте, что метрики доступны по REQUEST_METRICS_TOKEN'
+            )
+            response = client.get(url, HTTP_AUTHORIZATION='Bearer wrong')
+            assert response.status_code == 401
+        with override_settings(REQUEST_METRICS_ALLOWED_IPS=('127.0.0.1', )):
+            assert client.get(url).status_code == 200, (
+                'Проверьте, что метрики доступны с адресов из '
+                'REQUEST_METRICS_ALLOWED_IPS'
+            )
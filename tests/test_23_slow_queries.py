@@ -0,0 +1,74 @@
+import json
+import logging
+
+import pytest
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.slow_queries import explain
+
+from .common import create_titles
+
+
+@pytest.fixture
+def slow_queries(caplog):
+    logger = logging.getLogger('yamdb.slow_queries')
+    logger.addHandler(caplog.handler)
+    yield lambda: [json.loads(record.getMessage()) for record in caplog.records
+                   if record.name == 'yamdb.slow_queries']
+    logger.removeHandler(caplog.handler)
+
+
+class Test23SlowQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_disabled_by_default(self, admin_client, slow_queries):
+        create_titles(admin_client)
+        admin_client.get('/api/v1/titles/')
+        assert slow_queries() == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_slow_query_record(self, admin_client, slow_queries):
+        create_titles(admin_client)
+        with override_settings(SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD=0):
+            admin_client.get('/api/v1/titles/?year=2020')
+            admin_client.get('/api/v1/titles/?year=2000')
+        records = [
+            record for record in slow_queries()
+            if 'reviews_title' in record['sql']
+            and '"year" =' in record['sql'] and 'COUNT' not in record['sql']
+        ]
+        assert len(records) == 2, (
+            'Проверьте, что запросы дольше порога попадают в журнал'
+        )
+        first, second = records
+        assert first['view'] == 'api.titles.views.TitleViewSet.list'
+        assert first['route'] == 'title-list'
+        assert first['path'] == '/api/v1/titles/'
+        assert first['plan'], 'Проверьте, что в журнал пишется план EXPLAIN'
+        assert first['fingerprint'] == second['fingerprint']
+        assert first['params_fingerprint'] != second['params_fingerprint'], (
+            'Проверьте, что отпечаток параметров зависит от их значений'
+        )
+        assert not any(
+            record['sql'].startswith('EXPLAIN') for record in slow_queries()
+        ), 'Проверьте, что сам EXPLAIN не попадает в журнал'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_explain_savepoint(self):
+        from reviews.models import Genre
+
+        with transaction.atomic():
+            Genre.objects.create(name='Жанр', slug='genre')
+            with CaptureQueriesContext(connection) as context:
+                plan = explain(connection, 'SELECT * FROM missing', ())
+            assert plan[0].startswith('EXPLAIN не выполнен')
+            assert any(
+                query['sql'].startswith('SAVEPOINT')
+                for query in context.captured_queries
+            ), 'Проверьте, что EXPLAIN выполняется в точке сохранения'
+            assert not connection.needs_rollback, (
+                'Проверьте, что ошибка EXPLAIN не прерывает транзакцию'
+            )
+        assert Genre.objects.filter(slug='genre').exists()
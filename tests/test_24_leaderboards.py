@@ -0,0 +1,229 @@
+import random
+
+import pytest
+from django.db import OperationalError, connection
+from django.db.models.signals import post_delete
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from reviews.deleting import get_deleting
+from reviews.leaderboards import rebuild_leaderboards
+from reviews.models import Category, Genre, Leaderboard, Review, Title
+from users.models import User
+
+
+def snapshot():
+    return list(Leaderboard.objects.order_by(
+        'category', 'genre', 'kind', 'position'
+    ).values_list('category', 'genre', 'kind', 'position', 'title', 'value'))
+
+
+def create_catalogue():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+    titles = []
+    for number in range(8):
+        title = Title.objects.create(
+            name=f'Произведение {number}', year=2000, category=category
+        )
+        title.genre.set(genres[:1 + number % 2])
+        titles.append(title)
+    users = [
+        User.objects.create(username=f'reader{number}',
+                            email=f'reader{number}@yamdb.fake')
+        for number in range(6)
+    ]
+    return category, genres, titles, users
+
+
+class Test24Leaderboards:
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(LEADERBOARD_SIZE=3)
+    def test_01_top_endpoint(self, client):
+        category, genres, titles, users = create_catalogue()
+        for title, scores in zip(titles, ([5], [9, 7], [10], [2, 3, 4])):
+            for user, score in zip(users, scores):
+                Review.objects.create(
+                    title=title, author=user, text='Отзыв', score=score
+                )
+        response = client.get('/api/v1/categories/movie/top/')
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 8, (
+            'Проверьте, что эндпоинт возвращает число произведений категории'
+        )
+        assert [item['id'] for item in data['rating']] == [
+            titles[2].id, titles[1].id, titles[0].id
+        ], 'Проверьте, что список `rating` упорядочен по рейтингу'
+        assert [item['id'] for item in data['reviews']] == [
+            titles[3].id, titles[1].id, titles[0].id
+        ], 'Проверьте, что список `reviews` упорядочен по числу отзывов'
+        assert data['rating'][0]['category'] == {
+            'name': 'Фильм', 'slug': 'movie'
+        }
+        genre = client.get('/api/v1/genres/comedy/top/').json()
+        assert genre['count'] == 4
+        assert [item['id'] for item in genre['rating']] == [
+            titles[1].id, titles[3].id
+        ]
+        assert client.get('/api/v1/genres/unknown/top/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(LEADERBOARD_SIZE=3)
+    def test_02_incremental_matches_rebuild(self):
+        category, genres, titles, users = create_catalogue()
+        rng = random.Random(1)
+        reviews = []
+        for _ in range(60):
+            title, user = rng.choice(titles), rng.choice(users)
+            review = Review.objects.filter(title=title, author=user).first()
+            if review is None:
+                reviews.append(Review.objects.create(
+                    title=title, author=user, text='Отзыв',
+                    score=rng.randint(1, 10)
+                ))
+            elif rng.random() < 0.3:
+                review.delete()
+            else:
+                review.score = rng.randint(1, 10)
+                review.save()
+            incremental = snapshot()
+            rebuild_leaderboards()
+            assert incremental == snapshot(), (
+                'Проверьте, что списки лучших обновляются при записи отзывов'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_titles_count(self):
+        category, genres, titles, users = create_catalogue()
+        genres[0].refresh_from_db()
+        assert genres[0].titles_count == 8
+        titles[0].genre.remove(genres[0])
+        titles[1].delete()
+        other = Category.objects.create(name='Книга', slug='book')
+        titles[2].category = other
+        titles[2].save()
+        counts = dict(Genre.objects.values_list('slug', 'titles_count'))
+        assert counts == {'drama': 6, 'comedy': 3}
+        counts = dict(Category.objects.values_list('slug', 'titles_count'))
+        assert counts == {'movie': 6, 'book': 1}, (
+            'Проверьте, что число произведений категории пересчитывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(LEADERBOARD_SIZE=3)
+    def test_04_incremental_without_rebuild(self):
+        category, genres, titles, users = create_catalogue()
+        rng = random.Random(2)
+        for _ in range(80):
+            title, user = rng.choice(titles), rng.choice(users)
+            review = Review.objects.filter(title=title, author=user).first()
+            if review is None:
+                Review.objects.create(
+                    title=title, author=user, text='Отзыв',
+                    score=rng.randint(1, 10)
+                )
+            elif rng.random() < 0.3:
+                review.delete()
+            else:
+                review.score = rng.randint(1, 10)
+                review.save()
+        incremental = snapshot()
+        rebuild_leaderboards()
+        assert incremental == snapshot(), (
+            'Проверьте, что списки лучших остаются верными после '
+            'многих перестановок на месте'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(LEADERBOARD_SIZE=3)
+    def test_05_rerank_in_place(self):
+        category, genres, titles, users = create_catalogue()
+        for title, score in zip(titles[:4], (9, 8, 7, 2)):
+            Review.objects.create(
+                title=title, author=users[0], text='Отзыв', score=score
+            )
+        review = Review.objects.create(
+            title=titles[2], author=users[1], text='Отзыв', score=9
+        )
+        with CaptureQueriesContext(connection) as context:
+            review.score = 10
+            review.save()
+        scans = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'ORDER BY "value" DESC' in query['sql']
+        ]
+        assert not scans, (
+            'Проверьте, что отзыв на произведение из списка лучших '
+            'переставляет список на месте, без перебора произведений'
+        )
+        incremental = snapshot()
+        rebuild_leaderboards()
+        assert incremental == snapshot()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_cascade_delete(self):
+        category, genres, titles, users = create_catalogue()
+        for title in titles:
+            for user in users[:3]:
+                Review.objects.create(
+                    title=title, author=user, text='Отзыв', score=5
+                )
+        with CaptureQueriesContext(connection) as context:
+            users[0].delete()
+        boards = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_leaderboard"' in query['sql']
+        ]
+        assert len(boards) == 1, (
+            'Проверьте, что при удалении автора списки лучших '
+            'обновляются один раз, а не на каждый отзыв'
+        )
+        with CaptureQueriesContext(connection) as context:
+            titles[0].delete()
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ], 'Проверьте, что рейтинг удаляемого произведения не пересчитывается'
+        incremental = snapshot()
+        rebuild_leaderboards()
+        assert incremental == snapshot()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_failed_delete(self):
+        category, genres, titles, users = create_catalogue()
+        for user in users[:3]:
+            Review.objects.create(
+                title=titles[0], author=user, text='Отзыв', score=5
+            )
+
+        def locked(sender, instance, **kwargs):
+            raise OperationalError('database is locked')
+
+        post_delete.connect(locked, sender=Review)
+        try:
+            for instance in (titles[0], users[0]):
+                with pytest.raises(OperationalError):
+                    instance.delete()
+        finally:
+            post_delete.disconnect(locked, sender=Review)
+        deleting = get_deleting()
+        assert not deleting.titles and not deleting.authors, (
+            'Проверьте, что неудачное удаление не оставляет состояния'
+        )
+        Review.objects.filter(author=users[1]).get().delete()
+        title = Title.objects.get(pk=titles[0].pk)
+        assert title.rating_count == title.reviews.count() == 2, (
+            'Проверьте, что после неудачного удаления рейтинг '
+            'снова пересчитывается'
+        )
+        users[2].delete()
+        incremental = snapshot()
+        rebuild_leaderboards()
+        assert incremental == snapshot()
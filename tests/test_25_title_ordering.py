@@ -0,0 +1,58 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test25TitleOrdering:
+
+    def create_catalogue(self, admin_client):
+        from reviews.models import Review
+        from users.models import User
+
+        titles, _, genres = create_titles(admin_client)
+        third = admin_client.post('/api/v1/titles/', data={
+            'name': 'Альманах', 'year': 1990, 'genre': [genres[0]['slug']],
+            'category': titles[0]['category'],
+        }).json()
+        users = [
+            User.objects.create(username=f'reader{number}',
+                                email=f'reader{number}@yamdb.fake')
+            for number in range(3)
+        ]
+        for title_id, scores in (
+            (titles[0]['id'], [4, 6]), (third['id'], [9, 8, 10]),
+        ):
+            for user, score in zip(users, scores):
+                Review.objects.create(
+                    title_id=title_id, author=user, text='Отзыв', score=score
+                )
+        return [titles[0]['id'], titles[1]['id'], third['id']]
+
+    def ids(self, client, ordering):
+        response = client.get(f'/api/v1/titles/?ordering={ordering}')
+        assert response.status_code == 200, ordering
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ordering(self, admin_client):
+        first, second, third = self.create_catalogue(admin_client)
+        assert self.ids(admin_client, 'year') == [third, first, second]
+        assert self.ids(admin_client, '-year') == [second, first, third]
+        assert self.ids(admin_client, 'name') == [third, first, second]
+        assert self.ids(admin_client, '-review_count') == [
+            third, first, second
+        ], 'Проверьте сортировку по числу отзывов'
+        rating = self.ids(admin_client, '-rating')
+        assert rating.index(third) < rating.index(first), (
+            'Проверьте сортировку по рейтингу'
+        )
+        response = admin_client.get(f'/api/v1/titles/{third}/')
+        assert response.json()['rating'] == 9
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_unknown_ordering(self, admin_client):
+        create_titles(admin_client)
+        response = admin_client.get('/api/v1/titles/?ordering=description')
+        assert response.status_code == 400, (
+            'Проверьте, что сортировка по неизвестному полю возвращает 400'
+        )
@@ -0,0 +1,71 @@
+import pytest
+
+from .common import create_comments, create_titles
+
+
+class Test26SparseFields:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_fields(self, admin_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        # Пользователь, валидаторы, COUNT и сама страница без prefetch жанров
+        with django_assert_num_queries(4):
+            response = admin_client.get(
+                '/api/v1/titles/?fields=id,name,rating'
+            )
+        assert response.status_code == 200
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                'Проверьте, что параметр `fields` оставляет в ответе '
+                'только перечисленные поля'
+            )
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        title = admin_client.get(f'{url}?fields=id,genre,category').json()
+        assert title == {
+            'id': titles[0]['id'],
+            'genre': titles[0]['genre'],
+            'category': titles[0]['category'],
+        }, 'Проверьте, что без `expand` вложенные объекты заменяются на slug'
+        title = admin_client.get(
+            f'{url}?fields=id,category&expand=category'
+        ).json()
+        assert set(title['category']) == {'name', 'slug'}
+        assert set(admin_client.get(url).json()) == {
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_columns_pruned(self, admin_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get('/api/v1/titles/?fields=id,name')
+        sql = context.captured_queries[-1]['sql']
+        assert '"description"' not in sql and 'reviews_category' not in sql, (
+            'Проверьте, что ненужные столбцы и связи не выбираются из базы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_and_comments(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        base = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for params in ('', 'pagination=cursor&'):
+            response = admin_client.get(f'{base}?{params}fields=id,score')
+            assert response.status_code == 200
+            for review in response.json()['results']:
+                assert set(review) == {'id', 'score'}
+        url = f'{base}{reviews[0]["id"]}/comments/?fields=text,author'
+        for comment in admin_client.get(url).json()['results']:
+            assert set(comment) == {'text', 'author'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_unknown_fields(self, admin_client):
+        create_titles(admin_client)
+        assert admin_client.get(
+            '/api/v1/titles/?fields=id,secret'
+        ).status_code == 400, 'Проверьте, что неизвестное поле даёт 400'
+        assert admin_client.get(
+            '/api/v1/titles/?expand=name'
+        ).status_code == 400
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from api.utils.renderers import FastJSONRenderer
+
+from .common import create_comments
+
+
+class Test27ValuesSerialization:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_response(self, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        title = titles[0]['id']
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/titles/?ordering=-rating',
+            '/api/v1/titles/?fields=id,genre,category',
+            '/api/v1/titles/?fields=name,category&expand=category',
+            f'/api/v1/titles/{title}/reviews/',
+            f'/api/v1/titles/{title}/reviews/?pagination=cursor',
+            f'/api/v1/titles/{title}/reviews/?fields=id,author',
+            f'/api/v1/titles/{title}/reviews/{reviews[0]["id"]}/comments/',
+        )
+        for url in urls:
+            expected = admin_client.get(url)
+            with override_settings(VALUES_SERIALIZATION=True):
+                response = admin_client.get(url)
+            assert response.status_code == 200, url
+            assert response.content == expected.content, (
+                f'Проверьте, что `{url}` через values() отдаёт тот же ответ'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_queries(self, admin_client, admin, django_assert_num_queries):
+        create_comments(admin_client, admin)
+        with override_settings(VALUES_SERIALIZATION=True):
+            # Пользователь, валидаторы, COUNT, страница и жанры страницы
+            with django_assert_num_queries(5):
+                admin_client.get('/api/v1/titles/')
+
+    def test_03_fast_renderer(self):
+        data = {
+            'text': 'Отзыв\u2028с разделителем\u2029',
+            'date': datetime(2020, 1, 1, 12, 30, tzinfo=timezone.utc),
+            'score': Decimal('9.5'),
+            'items': [1, 2.5, None, True],
+            5: 'ключ-число',
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Проверьте, что быстрый рендерер отдаёт то же, что JSONRenderer'
+        )
+        indented = FastJSONRenderer().render(
+            data, 'application/json; indent=2'
+        )
+        assert indented == JSONRenderer().render(
+            data, 'application/json; indent=2'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark(self, tmp_path):
+        output = tmp_path / 'serialization.json'
+        call_command(
+            'bench_serialization', titles=5, reviews=20, comments=10,
+            iterations=1, page_sizes='2,5', current_db=True,
+            output=str(output),
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        for endpoint in ('titles', 'reviews', 'comments'):
+            results = report['endpoints'][endpoint]['5']
+            assert set(results) == {
+                'serializer', 'serializer_fast_json', 'values_fast_json'
+            }
+            sizes = {result['bytes'] for result in results.values()}
+            assert len(sizes) == 1, (
+                f'Проверьте, что все способы сериализации `{endpoint}` '
+                'дают одинаковый ответ'
+            )
@@ -0,0 +1,82 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+
+from .common import auth_client
+
+PAGE_SIZES = (5, 50, 500)
+
+
+def create_discussion(size):
+    from reviews.models import Category, Comment, Review, Title
+    from users.models import User
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    title = Title.objects.create(name='Фильм', year=2000, category=category)
+    User.objects.bulk_create(
+        User(username=f'reader{number}', email=f'reader{number}@yamdb.fake')
+        for number in range(size)
+    )
+    users = list(User.objects.filter(username__startswith='reader'))
+    Review.objects.bulk_create(
+        Review(title=title, author=user, text='Отзыв', score=5)
+        for user in users
+    )
+    review = Review.objects.filter(title=title).order_by('id').first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Комментарий')
+        for user in users
+    )
+    return title, review, users
+
+
+def count_queries(client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, **kwargs)
+    assert response.status_code == 200, url
+    users = [
+        query for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+    return len(context.captured_queries), len(users), response
+
+
+class Test28AuthorQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('size', PAGE_SIZES)
+    def test_01_list_pages(self, size, admin_client, monkeypatch):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', size)
+        title, review, _ = create_discussion(size)
+        urls = (
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        )
+        for url in urls:
+            total, users, response = count_queries(admin_client, 'get', url)
+            assert len(response.json()['results']) == size
+            assert users == 1, (
+                f'Проверьте, что авторы `{url}` загружаются одним JOIN, '
+                'а не отдельным запросом на каждую запись'
+            )
+            assert total <= 5, (
+                f'Число запросов к `{url}` не должно зависеть '
+                f'от размера страницы: {total}'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_detail_and_update(self):
+        title, review, users = create_discussion(5)
+        client = auth_client(review.author)
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+        for method, kwargs in (
+            ('get', {}),
+            ('patch', {'data': '{"text": "Новый текст"}',
+                       'content_type': 'application/json'}),
+        ):
+            _, user_queries, _ = count_queries(client, method, url, **kwargs)
+            assert user_queries == 1, (
+                'Проверьте, что права автора проверяются по `author_id` '
+                'без повторной загрузки пользователя'
+            )
@@ -0,0 +1,65 @@
+import json
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+
+
+def parent_queries(context, table):
+    # выборки одного объекта по первичному ключу (get_object_or_404)
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+        and re.search(rf'WHERE .*"{table}"\."id" = \d+', query['sql'])
+    ]
+
+
+class Test29ParentObjects:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_belongs_to_title(self, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        review = reviews[0]['id']
+        other = titles[1]['id']
+        url = f'/api/v1/titles/{other}/reviews/{review}/comments/'
+        assert admin_client.get(url).status_code == 404, (
+            'Проверьте, что комментарии отзыва недоступны по адресу '
+            'чужого произведения'
+        )
+        response = auth_client(user).post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 404
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review}/comments/'
+        assert admin_client.get(url).status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_parent_loaded_once(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        title = titles[1]['id']
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                f'/api/v1/titles/{title}/reviews/',
+                data=json.dumps({'text': 'Отзыв', 'score': 7}),
+                content_type='application/json',
+            )
+        assert response.status_code == 201
+        assert len(parent_queries(context, 'reviews_title')) == 1, (
+            'Проверьте, что произведение из URL загружается один раз '
+            'на весь запрос'
+        )
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        for method, kwargs in (
+            ('get', {}),
+            ('post', {'data': {'text': 'Комментарий'}}),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                getattr(admin_client, method)(url, **kwargs)
+            parents = parent_queries(context, 'reviews_review')
+            assert len(parents) == 1 and 'reviews_title' in parents[0], (
+                'Проверьте, что отзыв и его произведение загружаются '
+                'одним запросом'
+            )
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews
+
+
+def selects(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+    ]
+
+
+class Test30ConstraintWrites:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_duplicate_review(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        data = json.dumps({'text': 'Отзыв', 'score': 7})
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                url, data=data, content_type='application/json'
+            )
+        assert response.status_code == 201
+        assert not selects(context, 'reviews_review'), (
+            'Проверьте, что перед созданием отзыва не выполняется '
+            'проверочный запрос, уникальность проверяет ограничение БД'
+        )
+        response = admin_client.post(
+            url, data=data, content_type='application/json'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение '
+            'возвращает статус 400'
+        )
+        assert 'non_field_errors' in response.json()
+        assert admin.reviews.filter(title_id=titles[1]['id']).count() == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_duplicate_signup(self, client, admin):
+        url = '/api/v1/auth/signup/'
+        data = {'username': 'unique_user', 'email': 'unique@yamdb.fake'}
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data=data)
+        assert response.status_code == 200
+        assert not selects(context, 'users_user'), (
+            'Проверьте, что регистрация не выполняет проверочных запросов '
+            'и не загружает пользователя повторно'
+        )
+        for field, value in (('username', admin.username),
+                             ('email', admin.email)):
+            other = {'username': 'other_user', 'email': 'other@yamdb.fake'}
+            response = client.post(url, data={**other, field: value})
+            assert response.status_code == 400
+            assert field in response.json(), (
+                'Проверьте, что при нарушении уникальности в ответе '
+                'указано поле с ошибкой'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_me_patch(self, admin_client, admin, moderator):
+        url = '/api/v1/users/me/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(url, data={'bio': 'О себе'})
+        assert response.status_code == 200
+        assert len(selects(context, 'users_user')) <= 1, (
+            'Проверьте, что изменение профиля не проверяет уникальность '
+            'username и email отдельными запросами'
+        )
+        response = admin_client.patch(url, data={'email': moderator.email})
+        assert response.status_code == 400
+        assert 'email' in response.json()
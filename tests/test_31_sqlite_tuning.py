@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+from api.sqlite import read_pragmas
+
+
+class Test31SqliteTuning:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pragmas(self):
+        connection.ensure_connection()
+        pragmas = read_pragmas(
+            connection, ('synchronous', 'cache_size', 'busy_timeout')
+        )
+        assert pragmas == {
+            'synchronous': 1,
+            'cache_size': settings.SQLITE_PRAGMAS['cache_size'],
+            'busy_timeout': settings.SQLITE_PRAGMAS['busy_timeout'],
+        }, 'Проверьте, что PRAGMA из SQLITE_PRAGMAS применяются к соединению'
+        assert settings.DATABASES['default']['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что соединения с базой постоянные'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_benchmark(self, tmp_path):
+        output = tmp_path / 'sqlite.json'
+        call_command(
+            'bench_sqlite', titles=3, reviews=10, comments=5, threads=1,
+            requests=10, write_share=0.5, current_db=True,
+            output=str(output),
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert set(report['profiles']) == {'baseline', 'tuned'}
+        for result in report['profiles'].values():
+            assert result['errors'] == 0
+            assert result['throughput_rps'] > 0
+        assert report['profiles']['baseline']['conn_max_age'] == 0
+        assert report['profiles']['tuned']['pragmas']['synchronous'] == 1
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError
+from django.test import override_settings
+
+from api.writes import WriteBusy, write_queue
+from reviews.models import Genre
+
+from .common import create_comments
+
+
+def wait_for_depth(depth):
+    deadline = time.monotonic() + 5
+    while write_queue.snapshot()['depth'] != depth:
+        assert time.monotonic() < deadline, 'Очередь записи не заполнилась'
+        time.sleep(0.01)
+
+
+def start(func, results):
+    def target():
+        try:
+            results.append(write_queue.submit(func))
+        except Exception as error:
+            results.append(error)
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread
+
+
+def blocking_job(release):
+    def job():
+        release.wait(5)
+        return Genre.objects.create(name='Первый', slug='first').slug
+    return job
+
+
+class Test32WriteQueue:
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(WRITE_GROUP_SIZE=5)
+    def test_01_group_commit(self):
+        write_queue.reset()
+        release = threading.Event()
+        results = []
+        threads = [start(blocking_job(release), results)]
+        wait_for_depth(0)
+        for number in range(3):
+            threads.append(start(
+                lambda number=number: Genre.objects.create(
+                    name=f'Жанр {number}', slug=f'genre-{number}'
+                ).slug,
+                results,
+            ))
+        wait_for_depth(3)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == [
+            'first', 'genre-0', 'genre-1', 'genre-2'
+        ], 'Проверьте, что каждая запись получает свой результат'
+        snapshot = write_queue.snapshot()
+        assert snapshot['jobs'] == 4
+        assert snapshot['commits'] == 2, (
+            'Проверьте, что ожидающие записи объединяются в одну транзакцию'
+        )
+        assert snapshot['wait'][2] == 4
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(WRITE_QUEUE_SIZE=1)
+    def test_02_bounded_queue(self):
+        write_queue.reset()
+        release = threading.Event()
+        results = []
+        threads = [start(blocking_job(release), results)]
+        wait_for_depth(0)
+        threads.append(start(lambda: 'second', results))
+        wait_for_depth(1)
+        with pytest.raises(WriteBusy):
+            write_queue.submit(lambda: 'third')
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == ['first', 'second']
+        assert write_queue.snapshot()['rejected'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(WRITE_RETRY_DELAY=0)
+    def test_03_retry_locked(self):
+        write_queue.reset()
+        attempts = []
+
+        def job():
+            attempts.append(1)
+            Genre.objects.create(name='Жанр', slug=f'genre-{len(attempts)}')
+            if len(attempts) < 3:
+                raise OperationalError('database is locked')
+            return len(attempts)
+
+        assert write_queue.submit(job) == 3
+        assert write_queue.snapshot()['retries'] == 2, (
+            'Проверьте, что запись повторяется после database is locked'
+        )
+        assert list(Genre.objects.values_list('slug', flat=True)) == [
+            'genre-3'
+        ], 'Проверьте, что неудачные попытки откатываются'
+        with pytest.raises(ValueError):
+            write_queue.submit(lambda: int('x'))
+
+    @pytest.mark.django_db(transaction=True)
+    @override_settings(REQUEST_METRICS=True)
+    def test_04_metrics(self, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        write_queue.reset()
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/',
+            data={'text': 'Комментарий'},
+        )
+        assert response.status_code == 201
+        text = admin_client.get('/api/v1/metrics/').content.decode()
+        assert 'yamdb_write_queue_depth 0' in text
+        assert 'yamdb_write_jobs_total 1' in text
+        assert 'yamdb_write_queue_wait_seconds_count 1' in text, (
+            'Проверьте, что время ожидания записи отдаётся в метриках'
+        )